@@ -69,6 +69,7 @@ ALL_SETTINGS = [  # [名称, 默认值, 是否在尝试修复时重置, 简介]
     ["PROJECT_ID", "", False, "Qexo项目ID"],
     ["ALLOW_FRIEND", "否", False, "是否允许友链申请 是/否"],
     ["LAST_LOGIN", "", True, "博主最后上线时间(无需更改)"],
+    ["POST_INDEX_TIME", "", True, "最后一次建立文章索引的时间(无需更改)"],
     ["IMG_HOST", "{\"type\":\"关闭\",\"params\":{}}", False, "2.0之后的图床设置JSON"],
     ["ONEPUSH", "", False, "OnePush消息通知"],
     ["PROVIDER", "", False, "2.0之后的平台JSON"],
@@ -98,6 +99,9 @@ ALL_SETTINGS = [  # [名称, 默认值, 是否在尝试修复时重置, 简介]
      '{"method":"本地","auto":"关闭","save_key":"excerpt","params":{"save_key":"excerpt","length":"200"}}', False,
      "文章截取配置JSON"],
     ["LANGUAGE", "zh_CN", True, "语言"],
+    ["CACHE_BACKEND", "{\"backend\":\"database\",\"params\":{}}", False, "缓存共享层JSON database/file/django"],
+    ["CACHE_TTL", "60", False, "进程内缓存有效期(秒)"],
+    ["PROVIDER_CONCURRENCY", "4", False, "逐级获取目录时的并发数上限"],
 ]
 
 VDITOR_LANGUAGES = ["zh_CN", "en_US", "zh_TW", "fr_FR", "ja_JP", "ko_KR", "pt_BR", "ru_RU", "sv_SE"]
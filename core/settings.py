@@ -181,6 +181,8 @@ if errors:
 if LOCAL_CONFIG:
     logging.info("获取本地配置文件成功, 使用本地配置部署")
     ALLOWED_HOSTS = configs.DOMAINS
+    if hasattr(configs, "CACHES"):  # 供 django 缓存后端使用
+        CACHES = configs.CACHES
 else:
     logging.info("未检测到本地配置, 使用环境变量获取配置")  # Serverless部署
     ALLOWED_HOSTS = json.loads(os.environ.get("DOMAINS", False)) if os.environ.get("DOMAINS", False) else ["*"]
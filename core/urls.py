@@ -34,6 +34,7 @@ urlpatterns = [
     path('api/new_post/', new_post, name='new_post'),
     path('api/delete/', delete, name='delete'),
     path('api/rename/', rename, name='rename'),
+    path('api/batch/', batch, name='batch'),
     path('api/upload/', upload_img, name='upload'),
     path('api/delete_img/', delete_img, name='delete_img'),
     path('api/set_hexo/', set_hexo, name='set_hexo'),
@@ -61,6 +62,10 @@ urlpatterns = [
     path('api/create_webhook/', create_webhook_config, name='create_webhook'),
     path('api/do_update/', do_update, name='do_update'),
     path('api/get_notifications/', get_notifications, name='get_notifications'),
+    path('api/get_metrics/', get_metrics, name='get_metrics'),
+    path('api/rebuild_post_index/', rebuild_post_index, name='rebuild_post_index'),
+    path('api/search_posts/', search_posts, name='search_posts'),
+    path('api/get_taxonomy/', get_taxonomy, name='get_taxonomy'),
     path('api/del_notifications/', del_notification, name='del_notifications'),
     path('api/clear_notifications/', clear_notification, name='clear_notifications'),
     path('api/set_onepush/', set_onepush, name='set_onepush'),
@@ -74,8 +79,11 @@ urlpatterns = [
 
     path('pub/save/', pub.save, name='pub_save'),
     path('pub/delete/', pub.delete, name='pub_delete'),
+    path('pub/batch/', pub.batch, name='pub_batch'),
     path('pub/create_webhook/', pub.create_webhook_config, name='pub_create_webhook'),
     path('pub/get_posts/', pub.get_posts, name='pub_get_posts'),
+    path('pub/search_posts/', pub.search_posts, name='pub_search_posts'),
+    path('pub/get_taxonomy/', pub.get_taxonomy, name='pub_get_taxonomy'),
     path('pub/get_pages/', pub.get_pages, name='pub_get_pages'),
     path('pub/get_configs/', pub.get_configs, name='pub_get_configs'),
     path('pub/get_images/', pub.get_images, name='pub_get_images'),
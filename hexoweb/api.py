@@ -10,6 +10,7 @@ from django.http import JsonResponse
 from django.views.decorators.csrf import csrf_exempt
 
 import hexoweb.libs.image
+import hexoweb.libs.ratelimit
 from hexoweb.libs.image import get_image_host, delete_image
 from .functions import *
 
@@ -99,7 +100,7 @@ def set_hexo(request):
         if verify["status"] > 0 or config != "Hexo" or force:
             save_setting("PROVIDER", provider)
             update_provider()
-            delete_all_caches()
+            delete_all_caches(keep_stale=False)
             del_all_postmark()
             context = {"msg": msg + gettext("HEXO_CONFIG_UPDATE"), "status": True}
         else:
@@ -380,6 +381,7 @@ def del_value(request):
         return JsonResponse(safe=False, data={"msg": gettext("NO_PERMISSION"), "status": False})
     try:
         SettingModel.objects.filter(name=request.POST.get("name")).delete()
+        invalidate_settings_cache()
         context = {"msg": gettext("DEL_SUCCESS"), "status": True}
     except Exception as e:
         logging.error(repr(e))
@@ -468,7 +470,7 @@ def save(request):
                 context = {"msg": gettext("SAVE_SUCCESS_AND_DEPLOY"), "status": True}
             else:
                 context = {"msg": gettext("SAVE_SUCCESS"), "status": True}
-            delete_all_caches()
+            patch_caches(saved={file_path: content})
         except Exception as error:
             logging.error(repr(error))
             context = {"msg": repr(error), "status": False}
@@ -492,10 +494,10 @@ def save_post(request):
                 context = {"msg": gettext("SAVE_SUCCESS_AND_DEPLOY"), "status": True, "path": result[1]}
             else:
                 context = {"msg": gettext("SAVE_SUCCESS"), "status": True, "path": result[1]}
-            mark_post(result[1], front_matter, True, file_name)
+            mark_post(result[1], front_matter, True, file_name, _front_matter + content)
             if result[2]:
                 del_postmark(result[2])
-            delete_all_caches()
+            patch_caches(saved={result[1]: _front_matter + content}, deleted=[result[2]])
         except Exception as error:
             logging.error(repr(error))
             context = {"msg": repr(error), "status": False}
@@ -507,9 +509,9 @@ def unpublish_post(request):
     if request.method == "POST":
         file_name = unicodedata.normalize('NFC', request.POST.get('file'))
         try:
-            Provider().unpublish_post(file_name)
+            draft = Provider().unpublish_post(file_name)
             context = {"msg": gettext("UNPUBLISH_SUCCESS"), "status": True, "file_name": file_name}
-            delete_all_caches()
+            patch_caches(moved={Provider().config["posts"]["save_path"].replace("${filename}", file_name): draft[1]})
         except Exception as error:
             logging.error(repr(error))
             context = {"msg": repr(error), "status": False}
@@ -521,9 +523,9 @@ def publish_post(request):
     if request.method == "POST":
         file_name = unicodedata.normalize('NFC', request.POST.get('file'))
         try:
-            Provider().publish_post(file_name)
+            result = Provider().publish_post(file_name)
             context = {"msg": gettext("PUBLISH_SUCCESS"), "status": True, "file_name": file_name}
-            delete_all_caches()
+            patch_caches(moved={result[2]: result[1]})
         except Exception as error:
             logging.error(repr(error))
             context = {"msg": repr(error), "status": False}
@@ -546,6 +548,7 @@ def save_page(request):
                 context = {"msg": gettext("SAVE_SUCCESS_AND_DEPLOY"), "status": True}
             else:
                 context = {"msg": gettext("SAVE_SUCCESS"), "status": True}
+            patch_caches(saved={file_path: front_matter + content})
         except Exception as error:
             logging.error(repr(error))
             context = {"msg": repr(error), "status": False}
@@ -566,7 +569,7 @@ def new_page(request):
                 logging.error(repr(error))
             result = Provider().save_page(file_path, scaffold, autobuild=False)
             context = {"msg": gettext("SAVE_SUCCESS"), "status": True, "path": result[1]}
-            delete_all_caches()
+            patch_caches(saved={result[1]: scaffold})
         except Exception as error:
             logging.error(repr(error))
             context = {"msg": repr(error), "status": False}
@@ -587,7 +590,7 @@ def new_post(request):
                 logging.error(repr(error))
             result = Provider().save_post(file_path, scaffold, autobuild=False, status=False)
             context = {"msg": gettext("SAVE_SUCCESS"), "status": True, "path": result[1], "name": file_path}
-            delete_all_caches()
+            patch_caches(saved={result[1]: scaffold})
         except Exception as error:
             logging.error(repr(error))
             context = {"msg": repr(error), "status": False}
@@ -609,8 +612,8 @@ def save_draft(request):
                 _front_matter += "\n"
             result = Provider().save_post(file_name, _front_matter + content, path=request.POST.get("path"), status=False, autobuild=False)
             context = {"msg": gettext("DRAFT_SAVE_SUCCESS"), "status": True, "path": result[1]}
-            mark_post(result[1], front_matter, False, file_name)
-            delete_all_caches()
+            mark_post(result[1], front_matter, False, file_name, _front_matter + content)
+            patch_caches(saved={result[1]: _front_matter + content})
         except Exception as error:
             logging.error(repr(error))
             context = {"msg": repr(error), "status": False}
@@ -632,10 +635,9 @@ def delete(request):
                 context = {"msg": gettext("DEL_SUCCESS_AND_DEPLOY"), "status": True}
             else:
                 context = {"msg": gettext("DEL_SUCCESS"), "status": True}
-            # Delete Caches
-            delete_all_caches()
+            patch_caches(deleted=[file_path])
             try:
-                PostModel.objects.filter(path=file_path).delete()
+                del_postmark(file_path)
             except:
                 pass
         except Exception as error:
@@ -644,6 +646,32 @@ def delete(request):
     return JsonResponse(safe=False, data=context)
 
 
+# 批量发布/取消发布/删除 api/batch
+@login_required(login_url="/login/")
+def batch(request):
+    context = dict(msg="Error!", status=False)
+    if request.method == "POST":
+        try:
+            operations = json.loads(unicodedata.normalize('NFC', request.POST.get('operations')))
+            if (not request.user.is_staff) and any(
+                    operation.get("action") == "delete" and operation.get("file", "")[:4] in ["yaml", ".yml"]
+                    for operation in operations):
+                logging.info(gettext("USER_IS_NOT_STAFF_DEL").format(request.user.username, request.path))
+                return JsonResponse(safe=False, data={"msg": gettext("NO_PERMISSION"), "status": False})
+            commitchange = f"Batch Update {len(operations)} Files by Qexo"
+            result = Provider().batch(operations, commitchange)
+            if result[0]:
+                context = {"msg": gettext("BATCH_SUCCESS_AND_DEPLOY").format(len(operations)), "status": True}
+            else:
+                context = {"msg": gettext("BATCH_SUCCESS").format(len(operations)), "status": True}
+            patch_caches(moved=dict(result[1], **result[2]), deleted=result[3])
+            batch_postmark(result[1], result[2], result[3])
+        except Exception as error:
+            logging.error(repr(error))
+            context = {"msg": repr(error), "status": False}
+    return JsonResponse(safe=False, data=context)
+
+
 # 重命名文件 api/rename
 @login_required(login_url="/login/")
 def rename(request):
@@ -660,10 +688,9 @@ def rename(request):
                 context = {"msg": gettext("RENAME_SUCCESS_AND_DEPLOY"), "status": True}
             else:
                 context = {"msg": gettext("RENAME_SUCCESS"), "status": True}
-            # Delete Caches
-            delete_all_caches()
+            patch_caches(moved={file_path: new_path})
             try:
-                PostModel.objects.filter(path=file_path).delete()
+                del_postmark(file_path)
             except:
                 pass
         except Exception as error:
@@ -842,6 +869,53 @@ def del_friend(request):
     return JsonResponse(safe=False, data=context)
 
 
+# 获取请求额度与调用统计 api/get_metrics
+@login_required(login_url="/login/")
+def get_metrics(request):
+    try:
+        context = {"data": {"github": hexoweb.libs.ratelimit.all_stats()}, "status": True}
+    except Exception as error:
+        logging.error(repr(error))
+        context = {"msg": repr(error), "status": False}
+    return JsonResponse(safe=False, data=context)
+
+
+# 全文搜索文章 api/search_posts
+@login_required(login_url="/login/")
+def search_posts(request):
+    try:
+        results = full_text_search(request.GET.get("s"), int(request.GET.get("limit") or 20))
+        context = {"status": True, "results": results}
+    except Exception as error:
+        logging.error(repr(error))
+        context = {"msg": repr(error), "status": False}
+    return JsonResponse(safe=False, data=context)
+
+
+# 获取标签与分类统计(包含草稿) api/get_taxonomy
+@login_required(login_url="/login/")
+def get_taxonomy(request):
+    try:
+        kinds = [request.GET.get("kind")] if request.GET.get("kind") else TAXONOMY_KINDS
+        context = {"status": True, "data": aggregate_taxonomy(kinds, request.GET.get("name"))}
+    except Exception as error:
+        logging.error(repr(error))
+        context = {"msg": repr(error), "status": False}
+    return JsonResponse(safe=False, data=context)
+
+
+# 重建文章索引 api/rebuild_post_index
+@login_required(login_url="/login/")
+def rebuild_post_index(request):
+    try:
+        index_posts_in_background()
+        context = {"msg": gettext("INDEX_POSTS_STARTED"), "status": True}
+    except Exception as error:
+        logging.error(repr(error))
+        context = {"msg": repr(error), "status": False}
+    return JsonResponse(safe=False, data=context)
+
+
 # 获取全部消息 api/get_notifications
 @login_required(login_url="/login/")
 def get_notifications(request):
@@ -850,17 +924,17 @@ def get_notifications(request):
         latest = get_latest_version()
         latest["newer_text"] = latest["newer_text"].replace("<h2>", "<h5>")
         if latest["status"]:
-            cache = Cache.objects.filter(name="update")
-            if cache.count():
-                if (cache.first().content != latest["newer_time"]) and latest["hasNew"]:
+            cache = get_caches("update")
+            if cache:
+                if (cache != latest["newer_time"]) and latest["hasNew"]:
                     CreateNotification(gettext("UPDATE_LABEL"), gettext("UPDATE_CONTENT").format(latest["newer"], latest["newer_text"]),
                                        time())
-                    update_caches("update", latest["newer_time"], "text")
+                    update_caches("update", latest["newer_time"])
             else:
                 if latest["hasNew"]:
                     CreateNotification(gettext("UPDATE_LABEL"), gettext("UPDATE_CONTENT").format(latest["newer"], latest["newer_text"]),
                                        time())
-                    update_caches("update", latest["newer_time"], "text")
+                    update_caches("update", latest["newer_time"])
         context = {"data": GetNotifications(), "status": True}
     except Exception as error:
         logging.error(repr(error))
@@ -1,9 +1,13 @@
+import contextvars
 import json
 import logging
 import os
 import re
 import shutil
 import tarfile
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import timezone, timedelta, date, datetime
 from html import escape
 from time import strftime, localtime, time, sleep
@@ -16,6 +20,7 @@ import unicodedata
 import yaml
 from bs4 import BeautifulSoup
 from django.core.management import execute_from_command_line
+from django.db import connections, transaction, IntegrityError
 from django.template.defaulttags import register
 from markdown import markdown
 from urllib3 import disable_warnings
@@ -25,12 +30,17 @@ import hexoweb.libs.i18n
 from core.qexoSettings import ALL_SETTINGS
 from core.qexoSettings import QEXO_VERSION, QEXO_STATIC, VDITOR_LANGUAGES
 from core.settings import DATABASES
+from hexoweb.libs.cache import get_backend, LRUCache, SearchIndex, TieredCache
 from hexoweb.libs.elevator import elevator
 from hexoweb.libs.onepush import notify
-from hexoweb.libs.platforms import get_provider
+from hexoweb.libs.platforms import get_provider, git_blob_sha
+import hexoweb.libs.postparser
+from hexoweb.libs.postparser import parse_article, bulk_parse
+from hexoweb.libs.ratelimit import background
+from hexoweb.libs.search import get_engine as get_search_engine
 from hexoweb.libs.i18n import get_language
 from .models import Cache, SettingModel, FriendModel, NotificationModel, CustomModel, StatisticUV, StatisticPV, \
-    ImageModel, TalkModel, PostModel
+    ImageModel, TalkModel, PostModel, PostSearch, PostTerm, LeaseModel
 
 disable_warnings()
 
@@ -39,9 +49,81 @@ logging.basicConfig(level=logging.INFO,
                     datefmt="%d/%b/%Y %H:%M:%S")
 
 
+SETTINGS_CHECK_INTERVAL = 1  # 秒, 两次检查设置版本号的最小间隔
+# 经常写入的设置 直接读写数据库, 不更新版本号以免其他进程反复重新加载
+VOLATILE_SETTINGS = ("LAST_LOGIN", "POST_INDEX_TIME")
+
+_settings = {"data": None, "generation": None, "checked": 0.0}
+_settings_lock = threading.Lock()
+
+
+# 获取跨进程共享的版本号 任意进程修改数据后更新版本号, 其他进程比对后重新加载
+def get_generation(name):
+    return Cache.objects.filter(name="generation." + name).values_list("content", flat=True).first() or ""
+
+
+def bump_generation(name):
+    generation = uuid.uuid4().hex
+    if not Cache.objects.filter(name="generation." + name).update(content=generation):
+        Cache.objects.create(name="generation." + name, content=generation)
+    return generation
+
+
+LEASE_TTL = 120  # 秒, 租约持有者异常退出后自动过期的时间
+LEASE_WAIT = 3  # 秒, 其他进程持有租约时在请求内最多等待的时间
+LEASE_POLL_INTERVAL = 0.25
+
+
+# 跨进程租约 保证同一时刻只有一个进程执行某项任务
+def acquire_lease(name, ttl=LEASE_TTL):
+    """获取租约 成功返回令牌, 已被其他进程持有时返回None"""
+    token = uuid.uuid4().hex
+    now = time()
+    # 租约已过期时按条件更新接管, 只有一个进程的更新能命中
+    if LeaseModel.objects.filter(name=name, expires__lt=now).update(token=token, expires=now + ttl):
+        return token
+    try:
+        with transaction.atomic():  # 名称唯一, 同时插入时只有一个进程成功
+            LeaseModel.objects.create(name=name, token=token, expires=now + ttl)
+    except IntegrityError:
+        return None
+    return token
+
+
+def renew_lease(name, token, ttl=LEASE_TTL):
+    """延长仍由自己持有的租约 已过期并被其他进程接管时返回False"""
+    return bool(LeaseModel.objects.filter(name=name, token=token).update(expires=time() + ttl))
+
+
+def release_lease(name, token):
+    LeaseModel.objects.filter(name=name, token=token).delete()
+
+
+def _get_all_settings():
+    if _settings["data"] is not None and time() - _settings["checked"] < SETTINGS_CHECK_INTERVAL:
+        return _settings["data"]
+    with _settings_lock:
+        if _settings["data"] is not None and time() - _settings["checked"] < SETTINGS_CHECK_INTERVAL:
+            return _settings["data"]
+        # 先读取版本号再读取数据, 避免把旧数据记为新版本
+        generation = get_generation("settings")
+        if _settings["data"] is None or generation != _settings["generation"]:
+            _settings["data"] = dict(SettingModel.objects.values_list("name", "content"))
+            _settings["generation"] = generation
+        _settings["checked"] = time()
+        return _settings["data"]
+
+
+def invalidate_settings_cache():
+    bump_generation("settings")
+    _settings["data"] = None
+
+
 def get_setting(name):
     try:
-        return SettingModel.objects.get(name=name).content
+        if name in VOLATILE_SETTINGS:
+            return SettingModel.objects.filter(name=name).values_list("content", flat=True).first() or ""
+        return _get_all_settings().get(name, "")
     except Exception:
         return ""
 
@@ -76,10 +158,40 @@ def gettext(value):
     return Language()["data"].get(value, value)
 
 
+def _on_files_changed(saved, deleted):  # 本地文件在 Qexo 以外被修改
+    try:
+        patch_caches(saved=saved, deleted=deleted)
+    finally:
+        connections.close_all()
+    index_posts_in_background()
+
+
+def _elect_watcher():
+    # 每个进程都会启动监视线程, 只有持有租约的进程比对文件, 避免重复修补缓存与重建索引
+    token = None
+
+    def elect(ttl):
+        nonlocal token
+        try:
+            if token is None or not renew_lease("watch.files", token, ttl):
+                token = acquire_lease("watch.files", ttl)
+            return token is not None
+        finally:
+            connections.close_all()
+
+    return elect
+
+
 def update_provider():
     global _Provider
     _provider = json.loads(get_setting("PROVIDER"))
+    if hasattr(globals().get("_Provider"), "stop"):
+        _Provider.stop()
     _Provider = get_provider(_provider["provider"], **_provider["params"])
+    if get_setting("PROVIDER_CONCURRENCY"):
+        _Provider.concurrency = int(get_setting("PROVIDER_CONCURRENCY"))
+    if hasattr(_Provider, "watch"):
+        _Provider.watch(_on_files_changed, _elect_watcher())
     return _Provider
 
 
@@ -167,125 +279,261 @@ def get_custom_config():
     return context
 
 
+_caches = {"config": None, "cache": None}
+
+
+def Caches():
+    config = (get_setting("CACHE_BACKEND"), get_setting("CACHE_TTL"))
+    if _caches["cache"] is None or _caches["config"] != config:
+        try:
+            backend = json.loads(config[0]) if config[0] else {"backend": "database", "params": {}}
+            backend = get_backend(backend["backend"], **backend.get("params", {}))
+        except Exception as e:
+            logging.error(gettext("CACHE_BACKEND_FAILED").format(repr(e)))
+            backend = get_backend("database")
+        _caches["cache"] = TieredCache(backend, ttl=int(config[1]) if config[1] else 60)
+        _caches["config"] = config
+    return _caches["cache"]
+
+
+def get_caches(name):
+    return Caches().get(name)
+
+
 # 更新缓存
-def update_caches(name, content, _type="json"):
-    caches = Cache.objects.filter(name=name)
-    if caches.count():
-        caches.delete()
-    posts_cache = Cache()
-    posts_cache.name = name
-    if _type == "json":
-        posts_cache.content = json.dumps(content)
-    else:
-        posts_cache.content = content
-    posts_cache.save()
+def update_caches(name, content):
+    Caches().set(name, content)
     logging.info(gettext("REBUILD_CACHE_SUCCESS").format(name))
 
 
+_search_indexes = LRUCache(maxsize=8)
+_search_results = LRUCache(maxsize=256)
+
+
 def _filter_items_by_search(items, search_term):
-    """过滤列表项，只保留名称中包含搜索词的项目"""
+    """过滤列表项，只保留名称或路径中包含搜索词的项目 索引与结果均保存在容量有限的LRU中"""
     if not search_term:
         return items
+    key = (id(items), search_term.casefold())
+    cached = _search_results.get(key)
+    if cached is not None and cached[0] is items:
+        return cached[1]
+    index = _search_indexes.get(id(items))
+    if index is None or index.items is not items:
+        index = SearchIndex(items)
+        _search_indexes.set(id(items), index)
+    results = index.search(search_term)
+    _search_results.set(key, (items, results))
+    return results
+
+
+def _sort_items(cache_name, items):
+    # 文章按 已发布/草稿 分组后按路径排序, 其余按路径排序, 保证就地修补与完整重建的顺序一致
+    if cache_name == "posts":
+        return sorted(items, key=lambda item: (not item["status"], item["path"]))
+    return sorted(items, key=lambda item: item["path"])
+
 
-    filtered_items = []
-    for item in items:
-        if search_term.upper() in item["name"].upper():
-            filtered_items.append(item)
-    return filtered_items
+LIST_CACHES = ("posts", "pages", "configs")
+STALE_PREFIX = "stale."  # 清除缓存时保留的旧列表, 重建完成前先返回旧数据
 
+_warming = set()
+_warming_lock = threading.Lock()
+_flights = dict()  # 缓存名 -> 本进程内的重建锁
+_flights_lock = threading.Lock()
 
-def _get_cached_or_fresh_data(cache_name, provider_method, search_term=None):
-    """从缓存获取数据或通过provider获取新数据"""
-    # 检查是否有现有缓存
-    old_cache = Cache.objects.filter(name=cache_name)
 
-    # 如果没有缓存或需要搜索，获取完整结果
-    if not old_cache.count() or search_term:
+def _single_flight(cache_name):
+    """
+    缓存缺失时重建, 同一缓存同时只有一个重建任务
+    本进程内的其他线程等待线程锁, 其他进程短暂等待数据库租约, 重建完成后直接读取结果, 超时后返回旧数据
+    重建时只获取一次文件树快照, 同时补齐其他缺失的列表
+    """
+    with _flights_lock:
+        lock = _flights.setdefault(cache_name, threading.Lock())
+    with lock:
+        results = get_caches(cache_name)
+        if results is not None:  # 等待期间已由其他线程重建
+            return results
+        token = acquire_lease("caches." + cache_name)
+        deadline = time() + LEASE_WAIT
+        while token is None and time() < deadline:  # 其他进程正在重建
+            sleep(LEASE_POLL_INTERVAL)
+            results = get_caches(cache_name)
+            if results is not None:
+                return results
+            token = acquire_lease("caches." + cache_name)
+        if token is None:  # 等待超时 有旧数据时先返回, 没有时自行重建
+            results = get_caches(STALE_PREFIX + cache_name)
+            if results is not None:
+                return results
         try:
-            if old_cache.count():
-                # 有缓存但需要搜索，先尝试从缓存过滤
-                cached_data = json.loads(old_cache.first().content)
-                filtered_data = _filter_items_by_search(cached_data, search_term)
-                update_caches(f"{cache_name}.{search_term}", filtered_data)
-                return filtered_data
-        except Exception:
-            pass
-
-        # 获取新数据
-        results = provider_method()
-        update_caches(cache_name, results)
-
-        if search_term:
-            filtered_results = _filter_items_by_search(results, search_term)
-            update_caches(f"{cache_name}.{search_term}", filtered_results)
-            return filtered_results
+            provider = Provider()
+            snapshot = provider.get_snapshot()
+            for name in LIST_CACHES:
+                if name != cache_name and get_caches(name) is not None:
+                    continue
+                items = _sort_items(name, getattr(provider, "get_" + name)(snapshot))
+                update_caches(name, items)
+                if name == cache_name:
+                    results = items
+        finally:
+            if token:
+                release_lease("caches." + cache_name, token)
         return results
 
-    # 直接返回缓存
+
+def rebuild_caches(names=LIST_CACHES):
+    """在当前线程重建缺失的列表缓存"""
+    for name in names:
+        try:
+            _single_flight(name)
+        except Exception as e:
+            logging.error(gettext("REBUILD_CACHE_FAILED").format(name, repr(e)))
+
+
+def _warm_worker(names):
     try:
-        return json.loads(old_cache.first().content)
-    except Exception:
-        results = provider_method()
-        update_caches(cache_name, results)
-        return results
+        with background():  # 请求额度不足时放弃预热, 继续返回旧数据
+            rebuild_caches(names)
+        if "posts" in names:  # 文章列表重建说明仓库有变化, 同步更新文章索引
+            index_posts_in_background()
+    finally:
+        with _warming_lock:
+            _warming.difference_update(names)
+        connections.close_all()
+
+
+def warm_caches(names=LIST_CACHES):
+    """在后台线程重建列表缓存 同一列表在本进程内同时只有一个重建线程"""
+    with _warming_lock:
+        names = [name for name in names if name not in _warming]
+        _warming.update(names)
+    if names:
+        threading.Thread(target=_warm_worker, args=(names,), name="qexo-cache-warmer", daemon=True).start()
+
+
+def _get_cached_or_fresh_data(cache_name, search_term=None):
+    """从缓存获取数据或通过provider获取新数据 返回副本, 调用方可以随意修改"""
+    results = get_caches(cache_name)
+    if results is None:
+        results = get_caches(STALE_PREFIX + cache_name)
+        if results is not None:  # 先返回旧列表 在后台重建
+            warm_caches([cache_name])
+        else:
+            results = _single_flight(cache_name)
+    return [dict(item) for item in _filter_items_by_search(results, search_term)]
 
 
 def update_posts_cache(s=None):
-    return _get_cached_or_fresh_data("posts", Provider().get_posts, s)
+    return _get_cached_or_fresh_data("posts", s)
 
 
 def update_pages_cache(s=None):
-    return _get_cached_or_fresh_data("pages", Provider().get_pages, s)
+    return _get_cached_or_fresh_data("pages", s)
 
 
 def update_configs_cache(s=None):
-    return _get_cached_or_fresh_data("configs", Provider().get_configs, s)
+    return _get_cached_or_fresh_data("configs", s)
 
 
-def delete_all_caches():
-    caches = Cache.objects.all()
-    for cache in caches:
-        if cache.name != "update":
-            cache.delete()
+def patch_caches(saved=None, deleted=None, moved=None):
+    """
+    保存、删除或移动文件后就地修补文章/页面/配置列表缓存, 不再重新遍历整个仓库
+    :param saved: {路径: 内容或文件大小}
+    :param deleted: [路径] 可以是目录
+    :param moved: {旧路径: 新路径}
+    """
+    saved = saved or dict()
+    deleted = [path.strip("/") for path in (deleted or list()) if path]
+    moved = moved or dict()
+    try:
+        provider = Provider()
+        for cache_name, kinds in (("posts", ("posts", "drafts")), ("pages", ("pages",)), ("configs", ("configs",))):
+            for name in (cache_name, STALE_PREFIX + cache_name):  # 旧数据也一并修补
+                items = get_caches(name)
+                if items is None:  # 尚无缓存 下次访问时完整重建
+                    continue
+                sizes = {item["path"]: item["size"] for item in items}
+                removed = set(saved) | set(moved) | set(moved.values())
+                results = [item for item in items if item["path"] not in removed and not any(
+                    item["path"] == path or item["path"].startswith(path + "/") for path in deleted)]
+                additions = {path: len(content.encode("utf8")) if isinstance(content, str) else content
+                             for path, content in saved.items()}
+                for old, new in moved.items():
+                    additions[new] = sizes.get(old, 0)
+                for path, size in additions.items():
+                    for kind in kinds:
+                        item = provider.get_item(kind, path, size)
+                        if item:
+                            results.append(item)
+                            break
+                results = _sort_items(cache_name, results)
+                if results != items:
+                    update_caches(name, results)
+    except Exception as e:
+        logging.error(gettext("PATCH_CACHE_FAILED").format(repr(e)))
+        delete_all_caches(keep_stale=False)
+
+
+def delete_all_caches(keep_stale=True, warm=True):
+    """
+    清除全部缓存
+    :param keep_stale: 保留当前列表作为旧数据, 重建完成前继续返回 切换Provider时应为False
+    :param warm: 清除后在后台重建文章/页面/配置列表
+    """
+    caches = Caches()
+    keep = ["update"]
+    if keep_stale:
+        for name in LIST_CACHES:
+            items = caches.get(name)
+            if items is not None:
+                caches.set(STALE_PREFIX + name, items)
+            keep.append(STALE_PREFIX + name)
+    caches.clear(keep=keep)
     logging.info(gettext("PURGE_ALL_CACHE_SUCCESS"))
+    if warm:
+        warm_caches()
 
 
 def save_setting(name, content):
     name = unicodedata.normalize('NFC', name)
-    content = unicodedata.normalize('NFC', content)
-    obj = SettingModel.objects.filter(name=name)
-    if obj.count() == 1:
-        obj.delete()
-    if obj.count() > 1:
-        for i in obj:
-            i.delete()
-    new_set = SettingModel()
-    new_set.name = str(name)
-    if content is not None:
-        new_set.content = str(content)
-    else:
-        new_set.content = ""
-    new_set.save()
+    content = unicodedata.normalize('NFC', content) if content is not None else ""
+    new_set, _ = SettingModel.objects.update_or_create(name=name, defaults={"content": content})
+    if name not in VOLATILE_SETTINGS:
+        bump_generation("settings")
+        if _settings["data"] is not None:
+            _settings["data"][new_set.name] = new_set.content
     logging.info(gettext("SAVE_SETTING") + "{} => {}".format(name, content if name != "PROVIDER" else "******"))
     return new_set
 
 
+# 在一个事务中批量写入多个设置 查询次数与设置数量无关
+def save_settings(settings):
+    settings = {unicodedata.normalize('NFC', name): unicodedata.normalize('NFC', content) if content is not None else ""
+                for name, content in settings.items()}
+    if not settings:
+        return 0
+    with transaction.atomic():
+        # 先插入缺失的设置, 已存在(包括其他进程同时插入)的跳过, 此时全部行都存在, 再加锁统一更新
+        SettingModel.objects.bulk_create([SettingModel(name=name, content=content) for name, content in settings.items()],
+                                         ignore_conflicts=True)
+        exists = list(SettingModel.objects.select_for_update().filter(name__in=list(settings.keys())))
+        for setting in exists:
+            setting.content = settings[setting.name]
+        SettingModel.objects.bulk_update(exists, ["content"])
+    bump_generation("settings")
+    if _settings["data"] is not None:
+        _settings["data"].update(settings)
+    for name, content in settings.items():
+        logging.info(gettext("SAVE_SETTING") + "{} => {}".format(name, content if name != "PROVIDER" else "******"))
+    return len(settings)
+
+
 def save_custom(name, content):
     name = unicodedata.normalize('NFC', name)
-    content = unicodedata.normalize('NFC', content)
-    obj = CustomModel.objects.filter(name=name)
-    if obj.count() == 1:
-        obj.delete()
-    if obj.count() > 1:
-        for i in obj:
-            i.delete()
-    new_set = CustomModel()
-    new_set.name = str(name)
-    if content is not None:
-        new_set.content = str(content)
-    else:
-        new_set.content = ""
-    new_set.save()
+    content = unicodedata.normalize('NFC', content) if content is not None else ""
+    new_set, _ = CustomModel.objects.update_or_create(name=name, defaults={"content": content})
     logging.info(gettext("SAVE_CUSTOM") + "{} => {}".format(name, content))
     return new_set
 
@@ -401,11 +649,15 @@ def fix_all(all_settings=ALL_SETTINGS):
             deleted.append(query.name)
             query.delete()
             counter += 1
+    if deleted:
+        invalidate_settings_cache()
+    fixes = dict()
     for setting in all_settings:
         if (setting[0] not in already) or (setting[2]):
             additions.append(setting[0])
-            save_setting(setting[0], setting[1])
+            fixes[setting[0]] = setting[1]
             counter += 1
+    save_settings(fixes)
     logging.info(gettext("FIX_SUCCESS").format(counter))
     logging.info(gettext("DEL_VALUE") + str(deleted))
     logging.info(gettext("FIX_VALUE") + str(additions))
@@ -753,61 +1005,32 @@ def verify_provider(provider):
         return {"status": -1}
 
 
+def escape_passage(passage):  # 转为可以直接写入模板的字符串字面量
+    return repr(passage).replace("<", "\\<").replace(">", "\\>").replace("!", "\\!")
+
+
+def _placeholder(name):  # 脚手架占位符 {{ date }} {{ abbrlink }} 的值
+    if name == "date":
+        return datetime.now(timezone.utc).astimezone().isoformat()
+    return get_crc_by_time(str(time()), get_setting("ABBRLINK_ALG"), get_setting("ABBRLINK_REP"))
+
+
 def get_post_details(article, safe=True):
-    flag = False
-    if not (article.startswith("---") or article.startswith(";;;")):
-        flag = True
-        if ";;;" in article:
-            article = ";;;\n" + article
-        elif "---" in article:
-            article = "---\n" + article
-        else:
-            flag = False
-    abbrlink = get_crc_by_time(str(time()), get_setting("ABBRLINK_ALG"), get_setting("ABBRLINK_REP"))
-    dateformat = datetime.now(timezone.utc).astimezone().isoformat()
-    try:
-        if article[:3] == "---":
-            front_matter = re.search(r"---([\s\S]*?)---", article, flags=0).group()[3:-4]
-            front_matter = front_matter.replace("{{ date }}", dateformat).replace("{{ abbrlink }}", abbrlink).replace(
-                "{{ slug }}",
-                abbrlink).replace("{",
-                                  "").replace(
-                "}", "")
-            front_matter = yaml.safe_load(front_matter)
-        elif article[:3] == ";;;":
-            front_matter = json.loads("{{{}}}".format(
-                re.search(r";;;([\s\S]*?);;;", article, flags=0).group()[3:-4].replace("{{ date }}",
-                                                                                       dateformat).replace(
-                    "{{ abbrlink }}",
-                    abbrlink).replace(
-                    "{{ slug }}", abbrlink)))
-        else:
-            front_matter = {}
-    except Exception:
-        if flag:
-            article = article[3:]
-        return {}, repr(article).replace("<", "\\<").replace(">", "\\>").replace("!", "\\!") if safe else article
-    if not isinstance(front_matter, dict) or not front_matter:
-        logging.info(gettext("FRONT_MATTER_GET_ERROR").format(front_matter))
-        front_matter = {}
-        if flag:
-            article = article[3:]
-        passage = repr(article).replace("<", "\\<").replace(">", "\\>").replace("!", "\\!") if safe else article
-    else:
-        for key in front_matter.keys():
-            if type(front_matter.get(key)) == datetime:
-                front_matter[key] = front_matter[key].astimezone().isoformat()
-            elif type(front_matter.get(key)) == date:
-                front_matter[key] = front_matter[key].isoformat()
-        if safe:
-            passage = repr(re.search(r"[;-][;-][;-]([\s\S]*)", article[3:], flags=0).group()[3:]).replace("<",
-                                                                                                          "\\<").replace(
-                ">",
-                "\\>").replace(
-                "!", "\\!")
-        else:
-            passage = re.search(r"[;-][;-][;-]([\s\S]*)", article[3:], flags=0).group()[3:]
-    return front_matter, passage
+    # safe: 返回转义后的正文, 用于直接写入模板
+    front_matter, passage, loaded = parse_article(article, _placeholder)
+    if not front_matter and loaded is not None:
+        logging.info(gettext("FRONT_MATTER_GET_ERROR").format(loaded))
+    return front_matter, escape_passage(passage) if safe else passage
+
+
+def bulk_parse_posts(files, excerpt_length=200):
+    """
+    使用多个进程批量解析文章, 用于重建文章索引等需要解析大量文章的任务
+    :param files: 可迭代的 (路径, 内容)
+    :return: 按输入顺序产出 {"path", "front_matter", "body", "excerpt", "words", "images"} 的生成器
+    """
+    placeholders = {"date": _placeholder("date"), "abbrlink": _placeholder("abbrlink")}
+    return bulk_parse(files, excerpt_length, placeholders)
 
 
 def _export_model_data(model_class, field_mapping=None):
@@ -940,7 +1163,7 @@ def _bulk_import(model_class, data, field_mapping_func, model_name):
 
 
 def import_settings(ss):
-    return _bulk_import(
+    result = _bulk_import(
         SettingModel,
         ss,
         lambda s: SettingModel(
@@ -949,6 +1172,8 @@ def import_settings(ss):
         ),
         "设置"
     )
+    invalidate_settings_cache()
+    return result
 
 
 def import_images(ss):
@@ -1044,7 +1269,8 @@ def import_talks(ss):
 
 
 def import_posts(ss):
-    return _bulk_import(
+    # 导入的记录没有 blob sha 与全文搜索数据, 导入后在后台重新建立索引
+    result = _bulk_import(
         PostModel,
         ss,
         lambda s: PostModel(
@@ -1057,18 +1283,13 @@ def import_posts(ss):
         ),
         "文章"
     )
+    if result:
+        index_posts_in_background()
+    return result
 
 
 def excerpt_post(content, length, mark=True):
-    if content is None:
-        content = ""
-    result, content = "", (markdown(content) if mark else content)
-    soup = BeautifulSoup(content, 'html.parser')
-    for dom in soup:
-        if dom.name and dom.name not in ["script", "style"]:
-            result += re.sub("{(.*?)}", '', dom.get_text()).replace("\n", " ")
-            result += "" if result.endswith(" ") else " "
-    return result[:int(length)] + "..." if (len(result) if result else 0) > int(length) else result
+    return hexoweb.libs.postparser.excerpt(content, length, mark)
 
 
 def edit_talk(_id, content):
@@ -1084,40 +1305,274 @@ def escapeString(_str):
     return escape(_str)
 
 
-def mark_post(path, front_matter, status, filename):
-    p = PostModel.objects.filter(path=path)
-    if p:
-        p.first().delete()
-        PostModel.objects.create(
-            title=front_matter.get("title") if front_matter.get("title") else gettext("UNTITLED"),
-            path=path,
-            status=status,
-            front_matter=json.dumps(front_matter),
-            date=time(),
-            filename=filename
-        )
-        logging.info(f"{gettext('UPDATE_POST_INDEX')}：{path}")
-    else:
-        PostModel.objects.create(
-            title=front_matter.get("title") if front_matter.get("title") else gettext("UNTITLED"),
+def _front_matter_time(value):  # Front-matter 中的日期转为时间戳, 无法解析时返回None
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+    if isinstance(value, datetime):
+        return value.timestamp()
+    if isinstance(value, date):
+        return datetime(value.year, value.month, value.day).timestamp()
+    try:
+        return datetime.fromisoformat(str(value).strip()).timestamp()
+    except ValueError:
+        return None
+
+
+def _front_matter_terms(value):  # tags/categories 可能是字符串、列表或多级分类的嵌套列表
+    if value is None or value == "":
+        return []
+    if not isinstance(value, (list, tuple)):
+        return [str(value)]
+    terms = list()
+    for term in value:
+        for item in _front_matter_terms(term):
+            if item not in terms:
+                terms.append(item)
+    return terms
+
+
+def _post_fields(front_matter, default_date=None):
+    """根据 Front-matter 生成文章索引的字段 没有日期时使用 default_date 或当前时间"""
+    return {
+        "title": str(front_matter.get("title")) if front_matter.get("title") else gettext("UNTITLED"),
+        "date": _front_matter_time(front_matter.get("date")) or default_date or time(),
+        "updated": _front_matter_time(front_matter.get("updated")),
+        "tags": json.dumps(_front_matter_terms(front_matter.get("tags")), ensure_ascii=False),
+        "categories": json.dumps(_front_matter_terms(front_matter.get("categories")), ensure_ascii=False),
+        "abbrlink": str(front_matter.get("abbrlink") or "")[:0xFF],
+        "front_matter": json.dumps(front_matter)
+    }
+
+
+def _search_document(path, fields, body):  # 根据文章索引的字段生成全文搜索的内容
+    return PostSearch(path=path, title=fields["title"], body=body or "",
+                      tags=" ".join(json.loads(fields["tags"]) + json.loads(fields["categories"])))
+
+
+TAXONOMY_KINDS = ("tags", "categories")
+SEARCH_LIMIT = 50  # 搜索接口一次返回的结果数上限
+
+
+def _post_terms(post):  # 文章索引中的标签与分类记录
+    return [PostTerm(post=post, kind=kind, name=name[:0xFF])
+            for kind in TAXONOMY_KINDS for name in json.loads(getattr(post, kind) or "[]")]
+
+
+def mark_post(path, front_matter, status, filename, content=None):
+    # content: 保存的完整文件内容, 用于记录文件版本使后台索引跳过该文件, 同时更新全文搜索
+    previous = PostModel.objects.filter(path=path).values_list("date", flat=True).first()
+    fields = _post_fields(front_matter, previous)
+    version = (Provider().get_versions([path])[path] or git_blob_sha(content)) if content is not None else ""
+    with transaction.atomic():
+        PostModel.objects.filter(path=path).delete()  # 标签与分类记录随之删除
+        post = PostModel.objects.create(
             path=path,
             status=status,
-            front_matter=json.dumps(front_matter),
-            date=time(),
-            filename=filename
+            filename=filename,
+            sha=version,
+            **fields
         )
-        logging.info(f"{gettext('UPDATE_POST_INDEX')}：{path}")
+        PostTerm.objects.bulk_create(_post_terms(post))
+        if content is not None:
+            PostSearch.objects.filter(path=path).delete()
+            _search_document(path, fields, get_post_details(content, safe=False)[1]).save()
+    logging.info(f"{gettext('UPDATE_POST_INDEX')}：{path}")
 
 
 def del_postmark(path):
-    p = PostModel.objects.filter(path=path)
-    if p:
-        p.first().delete()
+    PostSearch.objects.filter(path=path).delete()
+    if PostModel.objects.filter(path=path).delete()[0]:
         logging.info(f"{gettext('DEL_POST_INDEX')}：{path}")
 
 
+def batch_postmark(published=None, unpublished=None, deleted=None):
+    """
+    批量更新文章索引
+    :param published: 发布的{旧路径: 新路径}
+    :param unpublished: 取消发布的{旧路径: 新路径}
+    :param deleted: [删除的文件路径] 目录需先展开, 见 Provider.batch
+    """
+    published = published or dict()
+    moved = dict(published, **(unpublished or dict()))
+    with transaction.atomic():
+        PostModel.objects.filter(path__in=list(moved.values())).exclude(path__in=list(moved.keys())).delete()
+        posts = list(PostModel.objects.filter(path__in=list(moved.keys())))
+        for post in posts:
+            post.status = post.path in published
+            post.path = moved[post.path]
+        PostModel.objects.bulk_update(posts, ["path", "status"])
+        PostSearch.objects.filter(path__in=list(moved.values())).exclude(path__in=list(moved.keys())).delete()
+        documents = list(PostSearch.objects.filter(path__in=list(moved.keys())))
+        for document in documents:
+            document.path = moved[document.path]
+        PostSearch.objects.bulk_update(documents, ["path"])
+        if deleted:
+            PostModel.objects.filter(path__in=deleted).delete()
+            PostSearch.objects.filter(path__in=deleted).delete()
+    logging.info(f"{gettext('UPDATE_POST_INDEX')}：{len(moved) + len(deleted or [])}")
+
+
 def del_all_postmark():
     PostModel.objects.all().delete()
+    PostSearch.objects.all().delete()
+
+
+def aggregate_taxonomy(kinds=TAXONOMY_KINDS, name=None, published=False):
+    """
+    按标签/分类统计文章 一次查询取出全部记录
+    :param kinds: 需要的类型 tags/categories
+    :param name: 只返回该标签/分类
+    :param published: 只统计已发布的文章
+    :return: {"tags": [{"name": 名称, "count": 文章数, "posts": [{"title", "path", "filename", "status", "date"}, ...]}, ...],
+              "categories": [...]} 按文章数降序, 文章按日期降序
+    """
+    kinds = [kind for kind in kinds if kind in TAXONOMY_KINDS]
+    terms = PostTerm.objects.filter(kind__in=kinds)
+    if name is not None:
+        terms = terms.filter(name=name)
+    if published:
+        terms = terms.filter(post__status=True)
+    results = {kind: dict() for kind in kinds}
+    for kind, term, title, path, filename, status, post_date in terms.order_by("-post__date").values_list(
+            "kind", "name", "post__title", "post__path", "post__filename", "post__status", "post__date"):
+        item = results[kind].setdefault(term, {"name": term, "count": 0, "posts": []})
+        item["count"] += 1
+        item["posts"].append({"title": title, "path": path, "filename": filename, "status": status, "date": post_date})
+    return {kind: sorted(items.values(), key=lambda item: (-item["count"], item["name"]))
+            for kind, items in results.items()}
+
+
+def full_text_search(query, limit=20, published=False):
+    """
+    在文章正文、标题、标签与分类中搜索, 使用数据库的全文索引, 不访问仓库
+    :param limit: 返回的结果数, 最多 SEARCH_LIMIT 条
+    :param published: 为True时不返回草稿, 用于公开接口
+    :return: 按相关度排序的 [{"path": 文件路径, "title": 标题, "snippet": 高亮摘要(HTML), "score": 相关度}, ...]
+    """
+    limit = max(1, min(limit, SEARCH_LIMIT))
+    try:
+        return get_search_engine().search(query, limit, published)
+    except Exception as e:  # 全文索引不可用时逐条匹配
+        logging.error(gettext("SEARCH_POSTS_FAILED").format(repr(e)))
+        return get_search_engine("fallback").search(query, limit, published)
+
+
+def _stream_post_contents(provider, files, workers=8):
+    """
+    并发获取文章内容, 按输入顺序边获取边产出 (路径, 内容), 获取失败的文件跳过
+    每个请求复制调用方的上下文, 后台任务中的请求仍按后台请求限流
+    """
+    def fetch(file):
+        try:
+            return provider.get_content(file)
+        except Exception as e:
+            logging.error(gettext("FETCH_POST_FAILED").format(file, repr(e)))
+            return None
+
+    if not files:
+        return
+    with ThreadPoolExecutor(max_workers=min(workers, len(files))) as pool:
+        futures = [pool.submit(contextvars.copy_context().run, fetch, file) for file in files]
+        for file, future in zip(files, futures):
+            content = future.result()
+            if content is not None:
+                yield file, content
+
+
+def index_posts():
+    """
+    遍历文章目录, 将全部文章的 Front-matter 写入文章索引 PostModel
+    版本(blob sha, 本地为修改时间与大小)与索引相同的文件不再获取, 其余文件并发获取, 边获取边交给 bulk_parse_posts 解析
+    :return: {"created": 新增数, "updated": 更新数, "deleted": 删除数}
+    """
+    provider = Provider()
+    items = provider.get_posts(provider.get_snapshot())
+    versions = provider.get_versions([item["path"] for item in items])  # 整个快照只检查一次分支头
+    posts, duplicates = dict(), list()
+    for post in PostModel.objects.all():
+        if post.path in posts:
+            duplicates.append(post.id)
+        else:
+            posts[post.path] = post
+    searchable = set(PostSearch.objects.values_list("path", flat=True))
+    changed = {item["path"]: item for item in items
+               if item["path"] not in posts or item["path"] not in searchable or
+               not versions[item["path"]] or posts[item["path"]].sha != versions[item["path"]] or
+               posts[item["path"]].status != item["status"]}
+    created, updated, documents = list(), list(), list()
+    shas = dict()
+
+    def fetched():  # 获取后才能确定版本的文件(本地等), 内容与索引相同则不再解析
+        for path, content in _stream_post_contents(provider, list(changed.keys())):
+            item, post = changed[path], posts.get(path)
+            shas[path] = versions[path] or git_blob_sha(content)
+            if post and post.sha == shas[path] and post.status == item["status"] and path in searchable:
+                continue
+            yield path, content
+
+    # 边获取边解析, 解析与尚未完成的请求同时进行 索引不需要摘要与字数
+    for record in bulk_parse_posts(fetched(), excerpt_length=0):
+        path = record["path"]
+        item, post = changed[path], posts.get(path)
+        fields = dict(_post_fields(record["front_matter"], post.date if post else None),
+                      status=item["status"], filename=item["name"], sha=shas[path])
+        documents.append(_search_document(path, fields, record["body"]))
+        if post:
+            for key, value in fields.items():
+                setattr(post, key, value)
+            updated.append(post)
+        else:
+            created.append(PostModel(path=path, **fields))
+    paths = set(item["path"] for item in items)
+    # 列表为空时多半是读取失败, 不清空已有索引
+    removed = duplicates + ([post.id for path, post in posts.items() if path not in paths] if items else [])
+    with transaction.atomic():
+        PostModel.objects.bulk_create(created, batch_size=500)
+        PostModel.objects.bulk_update(updated, ["title", "date", "updated", "tags", "categories", "abbrlink",
+                                                "front_matter", "status", "filename", "sha"], batch_size=500)
+        for i in range(0, len(updated), 500):
+            PostTerm.objects.filter(post__in=updated[i:i + 500]).delete()
+        PostTerm.objects.bulk_create([term for post in created + updated for term in _post_terms(post)],
+                                     batch_size=500)
+        for i in range(0, len(removed), 500):
+            PostModel.objects.filter(id__in=removed[i:i + 500]).delete()
+        stale = [document.path for document in documents] + \
+                ([path for path in searchable if path not in paths] if items else [])
+        for i in range(0, len(stale), 500):
+            PostSearch.objects.filter(path__in=stale[i:i + 500]).delete()
+        PostSearch.objects.bulk_create(documents, batch_size=500)
+    result = {"created": len(created), "updated": len(updated), "deleted": len(removed)}
+    logging.info(gettext("INDEX_POSTS_SUCCESS").format(result["created"], result["updated"], result["deleted"]))
+    return result
+
+
+_indexing = threading.Lock()
+
+
+def _index_worker():
+    if not _indexing.acquire(blocking=False):  # 本进程已有索引任务
+        return
+    token = None
+    try:
+        token = acquire_lease("index.posts")
+        if token is None:  # 其他进程正在建立索引
+            return
+        save_setting("POST_INDEX_TIME", str(int(time())))  # 失败时也记录, 首页不再反复触发
+        with background():
+            index_posts()
+    except Exception as e:
+        logging.error(gettext("INDEX_POSTS_FAILED").format(repr(e)))
+    finally:
+        if token:
+            release_lease("index.posts", token)
+        _indexing.release()
+        connections.close_all()
+
+
+def index_posts_in_background():
+    """在后台线程更新文章索引 同一时刻只有一个索引任务"""
+    if not _indexing.locked():
+        threading.Thread(target=_index_worker, name="qexo-post-indexer", daemon=True).start()
 
 
 def convert_to_kb_mb_gb(size_in_bytes):
@@ -0,0 +1,8 @@
+from .core import all_backends
+from .core import get_backend
+from .core import get_params
+from .core import LRUCache
+from .core import TieredCache
+from .search import SearchIndex
+
+__all__ = ['all_backends', 'get_backend', 'get_params', 'LRUCache', 'TieredCache', 'SearchIndex']
@@ -0,0 +1,9 @@
+from . import database
+from . import file
+from . import django_cache
+
+_all_backends = {
+    database.Database.name: database.Database,
+    file.File.name: file.File,
+    django_cache.DjangoCache.name: django_cache.DjangoCache
+}
@@ -0,0 +1,24 @@
+from ..core import Backend, GENERATION_PREFIX
+
+
+class Database(Backend):
+    name = "database"
+
+    params = {}
+
+    def __init__(self):
+        from hexoweb.models import Cache
+        self.model = Cache
+
+    def get(self, name):
+        return self.model.objects.filter(name=name).values_list("content", flat=True).first()
+
+    def set(self, name, content):
+        if not self.model.objects.filter(name=name).update(content=content):
+            self.model.objects.create(name=name, content=content)
+
+    def delete(self, name):
+        self.model.objects.filter(name=name).delete()
+
+    def clear(self, keep=()):
+        self.model.objects.exclude(name__in=list(keep)).exclude(name__startswith=GENERATION_PREFIX).delete()
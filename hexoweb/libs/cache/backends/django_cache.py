@@ -0,0 +1,39 @@
+from ..core import Backend, GENERATION_PREFIX
+from hashlib import md5
+import uuid
+
+
+class DjangoCache(Backend):
+    name = "django"
+
+    def __init__(self, alias="default"):
+        from django.core.cache import caches
+        self.cache = caches[alias if alias else "default"]
+
+    params = {'alias': {"description": "Django 缓存别名", "placeholder": "留空为default"}}
+
+    def _key(self, name):
+        if name.startswith(GENERATION_PREFIX):
+            return "qexo:" + name
+        # 通过命名空间实现清空, 不影响同一缓存中的其他数据
+        namespace = self.cache.get("qexo:namespace")
+        if namespace is None:
+            namespace = uuid.uuid4().hex
+            self.cache.set("qexo:namespace", namespace, None)
+        return "qexo:{}:{}".format(namespace, md5(name.encode("utf8")).hexdigest())
+
+    def get(self, name):
+        return self.cache.get(self._key(name))
+
+    def set(self, name, content):
+        self.cache.set(self._key(name), content, None)
+
+    def delete(self, name):
+        self.cache.delete(self._key(name))
+
+    def clear(self, keep=()):
+        kept = {name: self.get(name) for name in keep}
+        self.cache.set("qexo:namespace", uuid.uuid4().hex, None)
+        for name, content in kept.items():
+            if content is not None:
+                self.set(name, content)
@@ -0,0 +1,51 @@
+from ..core import Backend, GENERATION_PREFIX
+from hashlib import md5
+from urllib.parse import quote, unquote
+import tempfile
+import os
+
+
+class File(Backend):
+    name = "file"
+
+    def __init__(self, path=""):
+        self.path = path if path else os.path.join(tempfile.gettempdir(), "qexo-cache")
+        os.makedirs(self.path, exist_ok=True)
+
+    params = {'path': {"description": "缓存目录", "placeholder": "留空为系统临时目录"}}
+
+    def _file(self, name):
+        filename = quote(name, safe="")
+        if len(filename) > 200:  # 文件名过长时使用摘要
+            filename = "~" + md5(name.encode("utf8")).hexdigest()
+        return os.path.join(self.path, filename + ".json")
+
+    def get(self, name):
+        try:
+            with open(self._file(name), "r", encoding="utf8") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def set(self, name, content):
+        file = self._file(name)
+        tmp = "{}.{}.tmp".format(file, os.getpid())
+        with open(tmp, "w", encoding="utf8") as f:
+            f.write(content)
+        os.replace(tmp, file)  # 原子替换, 避免其他进程读到写了一半的文件
+
+    def delete(self, name):
+        try:
+            os.remove(self._file(name))
+        except FileNotFoundError:
+            pass
+
+    def clear(self, keep=()):
+        keep = {os.path.basename(self._file(name)) for name in keep}
+        for file in os.listdir(self.path):
+            if file in keep or unquote(file).startswith(GENERATION_PREFIX):
+                continue
+            try:
+                os.remove(os.path.join(self.path, file))
+            except FileNotFoundError:
+                pass
@@ -0,0 +1,171 @@
+from .exceptions import NoSuchBackendError
+from collections import OrderedDict
+from time import monotonic
+import threading
+import logging
+import json
+import uuid
+
+GENERATION_PREFIX = "generation."  # 以此开头的键保存版本号, 清空缓存时保留
+GENERATION_KEY = GENERATION_PREFIX + "caches"
+
+_missing = object()
+
+
+class Backend(object):
+    """共享缓存层 保存序列化后的文本, 所有进程可见"""
+    name = None
+    params = None
+
+    def get(self, name):  # 不存在时返回None
+        ...
+
+    def set(self, name, content):
+        ...
+
+    def delete(self, name):
+        ...
+
+    def clear(self, keep=()):  # 删除除keep和版本号以外的全部缓存
+        ...
+
+
+class LRUCache(object):
+    """线程安全的LRU缓存 maxsize为总容量, 每项默认占用1, ttl为秒"""
+
+    def __init__(self, maxsize=128, ttl=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._size = 0
+        self._data = OrderedDict()  # key -> (过期时间, 值, 占用)
+        self._lock = threading.RLock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                self.misses += 1
+                return default
+            if item[0] is not None and item[0] < monotonic():
+                self._pop(key)
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return item[1]
+
+    def set(self, key, value, size=1, ttl=None):
+        ttl = self.ttl if ttl is None else ttl
+        with self._lock:
+            self._pop(key)
+            if size > self.maxsize:
+                return False
+            self._data[key] = (monotonic() + ttl if ttl else None, value, size)
+            self._size += size
+            while self._size > self.maxsize:
+                self._pop(next(iter(self._data)))
+            return True
+
+    def delete(self, key):
+        with self._lock:
+            return self._pop(key)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._size = 0
+
+    def stats(self):
+        return {"size": self._size, "maxsize": self.maxsize, "items": len(self._data), "hits": self.hits,
+                "misses": self.misses}
+
+    def _pop(self, key):
+        item = self._data.pop(key, None)
+        if item is None:
+            return False
+        self._size -= item[2]
+        return True
+
+    def __contains__(self, key):
+        return self.get(key, _missing) is not _missing
+
+    def __len__(self):
+        return len(self._data)
+
+
+class TieredCache(object):
+    """
+    两级缓存: 进程内保存解码后对象的LRU + 可插拔的共享层
+    写入时更新共享层的版本号, 其他进程每隔check_interval秒比对一次, 不一致则清空进程内缓存
+    """
+
+    def __init__(self, backend, maxsize=64, ttl=60, check_interval=1):
+        self.backend = backend
+        self.local = LRUCache(maxsize, ttl)
+        self.check_interval = check_interval
+        self._generation = None
+        self._checked = None
+
+    def get(self, name, default=None):
+        self._check_generation()
+        value = self.local.get(name, _missing)
+        if value is not _missing:
+            return value
+        content = self.backend.get(name)
+        if content is None:
+            return default
+        try:
+            value = json.loads(content)
+        except ValueError:
+            logging.error("缓存{}格式错误, 已忽略".format(name))
+            return default
+        self.local.set(name, value)
+        return value
+
+    def set(self, name, value):
+        self.backend.set(name, json.dumps(value))
+        self._bump()
+        self.local.set(name, value)
+
+    def delete(self, name):
+        self.backend.delete(name)
+        self._bump()
+        self.local.delete(name)
+
+    def clear(self, keep=()):
+        self.backend.clear(keep)
+        self._bump()
+        self.local.clear()
+
+    def _bump(self):
+        self.backend.set(GENERATION_KEY, uuid.uuid4().hex)
+
+    def _check_generation(self):
+        if self._checked is not None and monotonic() - self._checked < self.check_interval:
+            return
+        generation = self.backend.get(GENERATION_KEY)
+        if generation != self._generation:
+            self.local.clear()
+            self._generation = generation
+        self._checked = monotonic()
+
+
+from .backends import _all_backends
+
+
+def all_backends():
+    return list(_all_backends.keys())
+
+
+def get_params(backend_name):
+    if backend_name not in _all_backends:
+        raise NoSuchBackendError(backend_name)
+    return _all_backends[backend_name].params
+
+
+def get_backend(backend_name: str, **kwargs):
+    if backend_name not in _all_backends:
+        raise NoSuchBackendError(backend_name)
+    return _all_backends[backend_name](**kwargs)
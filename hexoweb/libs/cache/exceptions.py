@@ -0,0 +1,8 @@
+class QexoCacheException(Exception):
+    """Base QexoCache exception."""
+
+
+class NoSuchBackendError(QexoCacheException):
+    """
+    An unknown cache backend was requests, one that was not registered.
+    """
@@ -0,0 +1,29 @@
+from collections import defaultdict
+
+
+def _trigrams(text):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class SearchIndex(object):
+    """大小写无关的三元组索引 按子串查找列表项, 搜索词不足三个字符时逐项比对"""
+
+    def __init__(self, items, fields=("name", "path")):
+        self.items = items
+        # 字段间以换行分隔, 搜索词不会跨字段匹配
+        self.texts = ["\n".join(str(item.get(field, "")) for field in fields).casefold() for item in items]
+        self.grams = defaultdict(set)
+        for i, text in enumerate(self.texts):
+            for gram in _trigrams(text):
+                self.grams[gram].add(i)
+
+    def search(self, term):
+        term = term.casefold()
+        if len(term) < 3:
+            candidates = range(len(self.texts))
+        else:
+            postings = sorted((self.grams.get(gram, set()) for gram in _trigrams(term)), key=len)
+            if not postings[0]:
+                return []
+            candidates = sorted(set.intersection(*postings))
+        return [self.items[i] for i in candidates if term in self.texts[i]]
@@ -24,8 +24,11 @@ class Main(Language):
             "AUTHOR": "Author",
             "AUTO_PROVIDER_FAILED": "Error in automatic generation of PROVIDER, please check the configuration and submit",
             "BACKUP": "Backup File",
+            "BATCH_SUCCESS": "Batch of {} Operations Successful!",
+            "BATCH_SUCCESS_AND_DEPLOY": "Batch of {} Operations Successful and Deployment Submitted!",
             "BOTTOM_PH": "If multiple levels, please use JSON format",
             "CACHE": "Cache",
+            "CACHE_BACKEND_FAILED": "Invalid cache backend, falling back to database: {}",
             "CACHE_CLEAN_REQUEST": "Are you sure you want to clear all caches?",
             "CANCEL": "Cancel",
             "CAPTCHA_FAILED": "Captcha verification failed!",
@@ -62,8 +65,15 @@ class Main(Language):
             "DELETING": "Deleting...",
             "DEL_CONFIRM_1": "Are you sure you want to delete",
             "DEL_CONFIRM_2": "? This operation is irreversible",
+            "INDEX_POSTS_FAILED": "Failed to index posts: {}",
+            "INDEX_POSTS_STARTED": "Rebuilding the post index in the background",
+            "INDEX_POSTS_SUCCESS": "Post index updated: {} created, {} updated, {} deleted",
+            "FETCH_POST_FAILED": "Failed to fetch post {}, skipped: {}",
+            "PATCH_CACHE_FAILED": "Failed to patch caches, all caches purged: {}",
             "PUBLISH_CONFIRM_1": "Are you sure you want to publish",
             "PUBLISH_CONFIRM_2": "?",
+            "REBUILD_CACHE_FAILED": "Failed to rebuild {} cache: {}",
+            "SEARCH_POSTS_FAILED": "Full-text search failed, falling back to a scan: {}",
             "UNPUBLISH_CONFIRM_1": "Are you sure you want to unpublish",
             "UNPUBLISH_CONFIRM_2": "?",
             "DEL_FAILED": "Delete failed",
@@ -24,8 +24,11 @@ class Main(Language):
             "AUTHOR": "Author",
             "AUTO_PROVIDER_FAILED": "Automatic PROVIDER Generation Error, Please Check Configuration and Submit",
             "BACKUP": "Backup File",
+            "BATCH_SUCCESS": "Batch of {} Operations Successful!",
+            "BATCH_SUCCESS_AND_DEPLOY": "Batch of {} Operations Successful and Deployment Submitted!",
             "BOTTOM_PH": "If multi-level, please use JSON format",
             "CACHE": "Cache",
+            "CACHE_BACKEND_FAILED": "Invalid cache backend, falling back to database: {}",
             "CACHE_CLEAN_REQUEST": "Are you sure to clear all caches?",
             "CANCEL": "Cancel",
             "CAPTCHA_FAILED": "Captcha Verification Failed!",
@@ -62,8 +65,15 @@ class Main(Language):
             "DELETING": "Deleting...",
             "DEL_CONFIRM_1": "Are you sure to delete",
             "DEL_CONFIRM_2": "? This operation is irreversible",
+            "INDEX_POSTS_FAILED": "Failed to index posts: {}",
+            "INDEX_POSTS_STARTED": "Rebuilding the post index in the background",
+            "INDEX_POSTS_SUCCESS": "Post index updated: {} created, {} updated, {} deleted",
+            "FETCH_POST_FAILED": "Failed to fetch post {}, skipped: {}",
+            "PATCH_CACHE_FAILED": "Failed to patch caches, all caches purged: {}",
             "PUBLISH_CONFIRM_1": "Are you sure to publish",
             "PUBLISH_CONFIRM_2": "?",
+            "REBUILD_CACHE_FAILED": "Failed to rebuild {} cache: {}",
+            "SEARCH_POSTS_FAILED": "Full-text search failed, falling back to a scan: {}",
             "UNPUBLISH_CONFIRM_1": "Are you sure to unpublish",
             "UNPUBLISH_CONFIRM_2": "?",
             "DEL_FAILED": "Delete Failed",
@@ -24,8 +24,11 @@ class Main(Language):
             "AUTHOR": "Auteur",
             "AUTO_PROVIDER_FAILED": "Erreur lors de la génération automatique du PROVIDER, veuillez vérifier la configuration et soumettre",
             "BACKUP": "Sauvegarde",
+            "BATCH_SUCCESS": "{} opérations traitées avec succès !",
+            "BATCH_SUCCESS_AND_DEPLOY": "{} opérations traitées avec succès et déploiement soumis !",
             "BOTTOM_PH": "Si plusieurs niveaux, veuillez utiliser le format JSON",
             "CACHE": "Cache",
+            "CACHE_BACKEND_FAILED": "Backend de cache invalide, utilisation du cache en base de données : {}",
             "CACHE_CLEAN_REQUEST": "Êtes-vous sûr de vouloir effacer tout le cache ?",
             "CANCEL": "Annuler",
             "CAPTCHA_FAILED": "Échec de la vérification anti-robot !",
@@ -168,6 +171,10 @@ class Main(Language):
             "INDEX_GUIDE_TIP_4_P2": "nouvelle actualité",
             "INDEX_IMAGE_LABEL": "Total des images",
             "INDEX_IMAGE_TIP": "Essayez la gestion des images",
+            "INDEX_POSTS_FAILED": "Échec de l'indexation des articles : {}",
+            "INDEX_POSTS_STARTED": "Reconstruction de l'index des articles lancée en arrière-plan",
+            "INDEX_POSTS_SUCCESS": "Index des articles mis à jour : {} ajoutés, {} mis à jour, {} supprimés",
+            "FETCH_POST_FAILED": "Échec de la récupération de l'article {}, ignoré : {}",
             "INDEX_POST_LABEL": "Total des articles",
             "INDEX_POST_TIP": "Avez-vous écrit un article aujourd'hui ?",
             "INDEX_RANDOM_POSTS": "Articles aléatoires",
@@ -281,6 +288,7 @@ class Main(Language):
             "PAGE_LABEL": "Toutes les pages",
             "PAGE_NAME": "Nom de la page",
             "PASSWORD": "Mot de passe",
+            "PATCH_CACHE_FAILED": "Échec de la mise à jour du cache, tout le cache a été effacé : {}",
             "POST": "Article",
             "POSTS_LIST": "Liste des articles",
             "POST_ARGV_LABEL": "Paramètres de l'article",
@@ -298,6 +306,7 @@ class Main(Language):
             "PURGE_CACHE": "Purger le cache",
             "QEXO_MSG": "Messages Qexo",
             "READ_FILE": "Lire le fichier",
+            "REBUILD_CACHE_FAILED": "Échec de la reconstruction du cache {} : {}",
             "REBUILD_CACHE_SUCCESS": "Cache {} reconstruit avec succès",
             "RENAME": "Renommer",
             "RENAME_SUCCESS": "Renommé avec succès !",
@@ -333,6 +342,7 @@ class Main(Language):
             "SEARCH_ITEM": "Élément de recherche",
             "SEARCH_PAGE": "Rechercher les pages",
             "SEARCH_POST": "Rechercher les articles",
+            "SEARCH_POSTS_FAILED": "Échec de la recherche plein texte, recherche élément par élément : {}",
             "SEARCH_SCRIPT": "Rechercher les commandes",
             "SEARCH_SETTINGS": "Rechercher les paramètres",
             "SEARCH_TALK": "Rechercher les talks",
@@ -24,8 +24,11 @@ class Main(Language):
             "AUTHOR": "作者",
             "AUTO_PROVIDER_FAILED": "PROVIDERの自動生成エラー、設定を確認して提出してください",
             "BACKUP": "バックアップファイル",
+            "BATCH_SUCCESS": "{}件の一括処理成功！",
+            "BATCH_SUCCESS_AND_DEPLOY": "{}件の一括処理成功し、デプロイを提出しました！",
             "BOTTOM_PH": "複数階層の場合、JSON形式を使用してください",
             "CACHE": "キャッシュ",
+            "CACHE_BACKEND_FAILED": "キャッシュバックエンドの設定エラー、データベースキャッシュを使用します: {}",
             "CACHE_CLEAN_REQUEST": "すべてのキャッシュをクリアしてもよろしいですか",
             "CANCEL": "キャンセル",
             "CAPTCHA_FAILED": "ロボット認証失敗！",
@@ -168,6 +171,10 @@ class Main(Language):
             "INDEX_GUIDE_TIP_4_P2": "新しいニュースを共有",
             "INDEX_IMAGE_LABEL": "総画像",
             "INDEX_IMAGE_TIP": "画像管理を試す",
+            "INDEX_POSTS_FAILED": "記事インデックスの作成失敗: {}",
+            "INDEX_POSTS_STARTED": "バックグラウンドで記事インデックスの再構築を開始しました",
+            "INDEX_POSTS_SUCCESS": "記事インデックスを更新しました: 追加{} 更新{} 削除{}",
+            "FETCH_POST_FAILED": "記事{}の取得失敗、スキップします: {}",
             "INDEX_POST_LABEL": "総記事",
             "INDEX_POST_TIP": "新しい記事を書く",
             "INDEX_RANDOM_POSTS": "ランダム記事",
@@ -281,6 +288,7 @@ class Main(Language):
             "PAGE_LABEL": "すべてのページ",
             "PAGE_NAME": "ページ名",
             "PASSWORD": "パスワード",
+            "PATCH_CACHE_FAILED": "キャッシュの更新失敗、すべてのキャッシュをクリアしました: {}",
             "POST": "記事",
             "POSTS_LIST": "記事リスト",
             "POST_ARGV_LABEL": "記事パラメータ",
@@ -298,6 +306,7 @@ class Main(Language):
             "PURGE_CACHE": "キャッシュクリア",
             "QEXO_MSG": "Qexoメッセージ",
             "READ_FILE": "ファイル読み取り",
+            "REBUILD_CACHE_FAILED": "{}キャッシュの再構築失敗: {}",
             "REBUILD_CACHE_SUCCESS": "{}キャッシュ再構築成功",
             "RENAME": "名前変更",
             "RENAME_SUCCESS": "名前変更成功！",
@@ -333,6 +342,7 @@ class Main(Language):
             "SEARCH_ITEM": "検索項目",
             "SEARCH_PAGE": "ページ検索",
             "SEARCH_POST": "記事検索",
+            "SEARCH_POSTS_FAILED": "全文検索失敗、1件ずつの照合に切り替えます: {}",
             "SEARCH_SCRIPT": "コマンド検索",
             "SEARCH_SETTINGS": "設定検索",
             "SEARCH_TALK": "トーク検索",
@@ -24,8 +24,11 @@ class Main(Language):
             "AUTHOR": "작성자",
             "AUTO_PROVIDER_FAILED": "PROVIDER 자동 생성 오류, 설정을 확인하고 제출하세요",
             "BACKUP": "백업 파일",
+            "BATCH_SUCCESS": "{}개 일괄 처리 성공!",
+            "BATCH_SUCCESS_AND_DEPLOY": "{}개 일괄 처리 성공하고 배포 제출!",
             "BOTTOM_PH": "다중 계층인 경우 JSON 형식을 사용하세요",
             "CACHE": "캐시",
+            "CACHE_BACKEND_FAILED": "캐시 백엔드 설정 오류, 데이터베이스 캐시를 사용합니다: {}",
             "CACHE_CLEAN_REQUEST": "모든 캐시를 지우시겠습니까?",
             "CANCEL": "취소",
             "CAPTCHA_FAILED": "로봇 확인 실패!",
@@ -168,6 +171,10 @@ class Main(Language):
             "INDEX_GUIDE_TIP_4_P2": "새 소식을 공유하세요",
             "INDEX_IMAGE_LABEL": "총 이미지",
             "INDEX_IMAGE_TIP": "이미지 관리를 시도하세요",
+            "INDEX_POSTS_FAILED": "글 인덱스 생성 실패: {}",
+            "INDEX_POSTS_STARTED": "백그라운드에서 글 인덱스 재구축을 시작했습니다",
+            "INDEX_POSTS_SUCCESS": "글 인덱스 업데이트: 추가 {} 업데이트 {} 삭제 {}",
+            "FETCH_POST_FAILED": "글 {} 가져오기 실패, 건너뜁니다: {}",
             "INDEX_POST_LABEL": "총 게시물",
             "INDEX_POST_TIP": "오늘 게시물을 작성하셨나요?",
             "INDEX_RANDOM_POSTS": "랜덤 게시물",
@@ -280,6 +287,7 @@ class Main(Language):
             "PAGE_LABEL": "모든 페이지",
             "PAGE_NAME": "페이지 이름",
             "PASSWORD": "비밀번호",
+            "PATCH_CACHE_FAILED": "캐시 업데이트 실패, 모든 캐시를 삭제했습니다: {}",
             "POST": "게시물",
             "POSTS_LIST": "게시물 목록",
             "POST_ARGV_LABEL": "게시물 매개변수",
@@ -298,6 +306,7 @@ class Main(Language):
             "PURGE_CACHE": "캐시 클리어",
             "QEXO_MSG": "Qexo 메시지",
             "READ_FILE": "파일 읽기",
+            "REBUILD_CACHE_FAILED": "{} 캐시 재구축 실패: {}",
             "REBUILD_CACHE_SUCCESS": "{} 캐시 재구축 성공",
             "RENAME": "이름 변경",
             "RENAME_SUCCESS": "이름 변경 성공!",
@@ -333,6 +342,7 @@ class Main(Language):
             "SEARCH_ITEM": "검색 항목",
             "SEARCH_PAGE": "페이지 검색",
             "SEARCH_POST": "게시물 검색",
+            "SEARCH_POSTS_FAILED": "전문 검색 실패, 항목별 검색으로 전환합니다: {}",
             "SEARCH_SCRIPT": "명령 검색",
             "SEARCH_SETTINGS": "설정 검색",
             "SEARCH_TALK": "토크 검색",
@@ -24,8 +24,11 @@ class Main(Language):
             "AUTHOR": "作者",
             "AUTO_PROVIDER_FAILED": "自动生成PROVIDER错误，请检查配置并提交",
             "BACKUP": "备份文件",
+            "BATCH_SUCCESS": "批量处理{}项成功!",
+            "BATCH_SUCCESS_AND_DEPLOY": "批量处理{}项成功并提交部署!",
             "BOTTOM_PH": "若有多级, 请使用JSON格式",
             "CACHE": "缓存",
+            "CACHE_BACKEND_FAILED": "缓存后端配置错误, 使用数据库缓存: {}",
             "CACHE_CLEAN_REQUEST": "确定清除所有缓存吗",
             "CANCEL": "取消",
             "CAPTCHA_FAILED": "人机验证失败!",
@@ -62,8 +65,15 @@ class Main(Language):
             "DELETING": "正在删除中...",
             "DEL_CONFIRM_1": "确认要删除",
             "DEL_CONFIRM_2": "吗？此操作不可撤回",
+            "INDEX_POSTS_FAILED": "建立文章索引失败: {}",
+            "INDEX_POSTS_STARTED": "已在后台开始重建文章索引",
+            "INDEX_POSTS_SUCCESS": "文章索引已更新: 新增{} 更新{} 删除{}",
+            "FETCH_POST_FAILED": "获取文章{}失败, 跳过: {}",
+            "PATCH_CACHE_FAILED": "修补缓存失败, 已清除全部缓存: {}",
             "PUBLISH_CONFIRM_1": "确认要发布",
             "PUBLISH_CONFIRM_2": "吗？",
+            "REBUILD_CACHE_FAILED": "重建{}缓存失败: {}",
+            "SEARCH_POSTS_FAILED": "全文搜索失败, 改为逐条匹配: {}",
             "UNPUBLISH_CONFIRM_1": "确认要取消发布",
             "UNPUBLISH_CONFIRM_2": "吗？",
             "DEL_FAILED": "删除失败",
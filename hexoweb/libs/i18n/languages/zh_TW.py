@@ -24,8 +24,11 @@ class Main(Language):
             "AUTHOR": "作者",
             "AUTO_PROVIDER_FAILED": "自動生成PROVIDER錯誤，請檢查配置並提交",
             "BACKUP": "備份文件",
+            "BATCH_SUCCESS": "批量處理{}項成功!",
+            "BATCH_SUCCESS_AND_DEPLOY": "批量處理{}項成功並提交部署!",
             "BOTTOM_PH": "若有多級, 請使用JSON格式",
             "CACHE": "緩存",
+            "CACHE_BACKEND_FAILED": "緩存後端配置錯誤, 使用數據庫緩存: {}",
             "CACHE_CLEAN_REQUEST": "確定清除所有緩存嗎",
             "CANCEL": "取消",
             "CAPTCHA_FAILED": "人機驗證失敗!",
@@ -62,8 +65,15 @@ class Main(Language):
             "DELETING": "正在刪除中...",
             "DEL_CONFIRM_1": "確認要刪除",
             "DEL_CONFIRM_2": "嗎？此操作不可撤回",
+            "INDEX_POSTS_FAILED": "建立文章索引失敗: {}",
+            "INDEX_POSTS_STARTED": "已在後台開始重建文章索引",
+            "INDEX_POSTS_SUCCESS": "文章索引已更新: 新增{} 更新{} 刪除{}",
+            "FETCH_POST_FAILED": "獲取文章{}失敗, 跳過: {}",
+            "PATCH_CACHE_FAILED": "修補緩存失敗, 已清除全部緩存: {}",
             "PUBLISH_CONFIRM_1": "確認要發布",
             "PUBLISH_CONFIRM_2": "嗎？",
+            "REBUILD_CACHE_FAILED": "重建{}緩存失敗: {}",
+            "SEARCH_POSTS_FAILED": "全文搜索失敗, 改為逐條匹配: {}",
             "UNPUBLISH_CONFIRM_1": "確認要取消發布",
             "UNPUBLISH_CONFIRM_2": "嗎？",
             "DEL_FAILED": "刪除失敗",
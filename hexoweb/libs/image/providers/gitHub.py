@@ -10,12 +10,15 @@ from hashlib import md5
 
 from ..core import Provider
 from ..replace import replace_path
+from ...ratelimit import get_scheduler, scheduled
 
 
 def delete(config):
-    repo = github.Github(config.get("token")).get_repo(config.get("repo"))
-    repo.delete_file(config.get("path"), "Delete by Qexo", repo.get_contents(config.get("path")).sha,
-                     branch=config.get("branch"))
+    scheduler = get_scheduler(config.get("token"))
+    with scheduler.request():
+        repo = scheduler.client.get_repo(config.get("repo"), lazy=True)
+        repo.delete_file(config.get("path"), "Delete by Qexo", repo.get_contents(config.get("path")).sha,
+                         branch=config.get("branch"))
     return "删除成功"
 
 
@@ -28,7 +31,8 @@ class Main(Provider):
         self.branch = branch
         self.path = path
         self.url = url
-        self.repo = github.Github(self.token).get_repo(self._repo)
+        self.scheduler = get_scheduler(self.token)
+        self.repo = self.scheduler.client.get_repo(self._repo, lazy=True)
 
     params = {
         'token': {"description": "Github 密钥", "placeholder": "token"},
@@ -38,6 +42,7 @@ class Main(Provider):
         'url': {'description': '自定义域名', 'placeholder': '需填写完整路径'}
     }
 
+    @scheduled
     def upload(self, file):
         now = datetime.now()
         photo_stream = file.read()
@@ -2,5 +2,6 @@ from .core import all_providers
 from .core import all_configs
 from .core import get_provider
 from .core import get_params
+from .core import git_blob_sha
 
-__all__ = ['all_providers', 'get_provider', 'get_params', 'all_configs']
+__all__ = ['all_providers', 'get_provider', 'get_params', 'all_configs', 'git_blob_sha']
@@ -1,17 +1,122 @@
 from .exceptions import NoSuchProviderError
 from .configs import _all_configs as configs
+from ..cache import LRUCache
+from concurrent.futures import ThreadPoolExecutor
+from hashlib import sha1
+import contextvars
 import logging
+import time
+
+POOL_SIZE = 16  # 并发请求时每个平台客户端保持的连接数
+
+
+def git_blob_sha(content):  # 与 git hash-object 相同的 blob sha, 用于判断内容是否变化
+    content = content.encode("utf8")
+    return sha1(b"blob %d\0" % len(content) + content).hexdigest()
 
 
 class Provider(object):
     params = None
+    content_cache_size = 16 * 1024 * 1024  # 文件内容缓存的内存上限(字节)
+    concurrency = 4  # 逐级遍历时同时获取的目录数上限
+    snapshot_ttl = 30  # 批量读取版本时, 距上次检查分支头不足该秒数则直接使用快照
 
     def __init__(self, config):
         self.config = configs[config]
+        self._snapshot = (None, None)  # (分支头SHA, 快照)
+        self._checked = 0  # 上次确认快照与分支头一致的时间
+        self._versions = (None, dict())  # (快照, {路径: blob sha})
+        self._contents = LRUCache(self.content_cache_size)
 
-    def get_content(self, file):
+    def _get_content(self, file):
         ...
 
+    def _get_versions(self, refresh=False):
+        """
+        最新快照中 {文件路径: blob sha}, 仅当已有完整快照时生效, 否则返回None
+        :param refresh: 为True时总是检查分支头(其他进程可能已经提交), 否则距上次检查超过 snapshot_ttl 秒才检查
+        """
+        if self._snapshot[0] is None:
+            return None
+        snapshot = self.get_snapshot(refresh=refresh)
+        if self._versions[0] is not snapshot:
+            self._versions = (snapshot, {entry["path"]: entry.get("sha") for entry in snapshot})
+        return self._versions[1]
+
+    def _get_version(self, file, refresh=False):  # 文件当前版本的标识, 作为内容缓存的键 无法确定时返回None(不缓存)
+        versions = self._get_versions(refresh)
+        return versions.get(file) if versions is not None else None
+
+    def _get_blob_sha(self, file, refresh=False):  # 文件树快照中的 blob sha, 未知时返回None
+        try:
+            return self._get_version(file, refresh)
+        except Exception:
+            return None
+
+    def _get_blob_shas(self, refresh=False):  # 文件树快照中全部文件的 {路径: blob sha}, 批量提交时只检查一次分支头
+        try:
+            return self._get_versions(refresh) or dict()
+        except Exception:
+            return dict()
+
+    def _record_write(self, changes, head=None, parent=None):
+        """
+        写入成功后就地更新文件树快照中的 blob sha, 之后读取时不必重新获取整个文件树
+        :param changes: {文件路径: 内容} 内容为None表示已删除
+        :param head: 写入产生的提交SHA, parent: 该提交的父提交SHA
+        仅当父提交就是快照的分支头时快照才与新分支头一致, 否则下次读取时重新检查分支头
+        """
+        head_before, snapshot = self._snapshot
+        if head_before is None:
+            return
+        entries = {entry["path"]: entry for entry in snapshot}
+        for file, content in changes.items():
+            if content is None:
+                entries.pop(file, None)
+            else:
+                entries[file] = {"name": file.split("/")[-1],
+                                 "size": len(content.encode("utf8")),
+                                 "path": file,
+                                 "type": "file",
+                                 "sha": git_blob_sha(content)}
+        if head is not None and parent == head_before:
+            self._snapshot = (head, list(entries.values()))
+            self._checked = time.monotonic()
+        else:
+            self._snapshot = (head_before, list(entries.values()))
+            self._checked = 0
+
+    def get_blob_sha(self, file):  # 文件树快照中的 git blob sha, 本地等没有 sha 的平台返回None
+        sha = self._get_blob_sha(file)
+        return sha if isinstance(sha, str) else None
+
+    def get_versions(self, files):
+        """
+        多个文件当前的版本标识, 只检查一次分支头, 版本相同则内容相同
+        :return: {文件路径: blob sha} 无法确定时为None
+        """
+        shas = self._get_blob_shas()
+        return {file: shas.get(file) for file in files}
+
+    def get_content(self, file):  # 获取文件内容UTF8 先确认分支头, 未变化的文件直接从缓存读取
+        return self._read(file, refresh=True)
+
+    def _read(self, file, refresh):
+        try:
+            version = self._get_version(file, refresh)
+        except Exception as e:
+            logging.error("获取文件{}版本错误: {}".format(file, repr(e)))
+            version = None
+        if version is not None:
+            content = self._contents.get((file, version))
+            if content is not None:
+                logging.info("从缓存获取文件{}".format(file))
+                return content
+        content = self._get_content(file)
+        if version is not None:
+            self._contents.set((file, version), content, size=len(content.encode("utf8")))
+        return content
+
     def get_path(self, path):
         ...
 
@@ -21,6 +126,101 @@ class Provider(object):
     def delete(self, path, commitchange="Delete by Qexo", autobuild=True):
         ...
 
+    def commit(self, changes, commitchange="Update by Qexo", autobuild=True):
+        """
+        在一次提交中保存或删除多个文件, 不支持的平台逐个执行后部署一次
+        :param changes: {文件路径: 内容} 内容为None表示删除该文件
+        :return: 是否进行了自动部署
+        """
+        for file, content in changes.items():
+            if content is None:
+                self.delete(file, commitchange, False)
+            else:
+                self.save(file, content, commitchange, False)
+        return self.build() if autobuild else False
+
+    def get_contents(self, files, workers=8):  # 并发获取多个文件内容 {文件路径: 内容} 只确认一次分支头
+        if not files:
+            return dict()
+        try:
+            self._get_versions(refresh=True)
+        except Exception as e:
+            logging.error("读取文件树快照错误: {}".format(repr(e)))
+        with ThreadPoolExecutor(max_workers=min(workers, len(files))) as pool:
+            # 在调用方的上下文中执行, 保留后台任务等标记
+            futures = [pool.submit(contextvars.copy_context().run, self._read, file, False) for file in files]
+            return dict(zip(files, (future.result() for future in futures)))
+
+    def batch(self, operations, commitchange="Batch Update by Qexo", autobuild=True):
+        """
+        在一次提交中批量发布、取消发布或删除
+        :param operations: [{"action": "publish/unpublish/delete", "file": "文章名(发布/取消发布)或文件路径(删除)"}, ...]
+        :return: [是否进行了自动部署, 发布的{旧路径: 新路径}, 取消发布的{旧路径: 新路径}, [删除的文件路径(目录已展开)]]
+        """
+        published, unpublished, deleted = dict(), dict(), list()
+        for operation in operations:
+            action, file = operation.get("action"), operation.get("file")
+            if action == "delete":
+                deleted.append(file)
+                continue
+            if action not in ("publish", "unpublish"):
+                raise Exception("不支持的操作: {}".format(action))
+            if not self.config["drafts"]["save_path"]:
+                raise Exception("当前配置不支持草稿")
+            draft_file = self.config["drafts"]["save_path"].replace("${filename}", file)
+            post_file = self.config["posts"]["save_path"].replace("${filename}", file)
+            if action == "publish":
+                published[operation.get("path") or draft_file] = post_file
+            else:
+                unpublished[operation.get("path") or post_file] = draft_file
+        moved = dict(published, **unpublished)
+        contents = self.get_contents(list(moved.keys()))
+        changes = dict()
+        for file in self._expand(deleted):
+            changes[file] = None
+        for old, new in moved.items():
+            changes[old] = None
+        for old, new in moved.items():
+            changes[new] = contents[old]
+        return [self.commit(changes, commitchange, autobuild), published, unpublished,
+                [file for file, content in changes.items() if content is None and file not in moved]]
+
+    def _expand(self, paths):
+        """
+        把路径中的目录展开为其中的全部文件 只获取一次文件树快照
+        快照遍历范围内的路径直接从快照中查找, 范围外的路径才单独获取目录树
+        """
+        try:
+            snapshot, walks = self.get_snapshot(), self._walks()
+        except Exception as e:
+            logging.error("读取文件树快照错误: {}".format(repr(e)))
+            snapshot, walks = list(), list()
+        results = list()
+        for path in paths:
+            path = path.replace("\\", "/").strip("/")
+            if any(self._covers(walk, (path, -1, [])) for walk in walks):
+                files = [entry["path"] for entry in snapshot if entry["type"] == "file" and (
+                    entry["path"] == path or entry["path"].startswith(path + "/"))]
+            else:
+                try:
+                    files = [entry["path"] for entry in self.get_tree(path, -1) if entry["type"] == "file"]
+                except Exception:  # 不是目录
+                    files = list()
+            results += files or [path]
+        return results
+
+    def exists(self, file):  # 文件是否存在 优先使用文件树快照
+        try:
+            if self._get_version(file) is not None:
+                return True
+        except Exception:
+            pass
+        try:
+            self._get_content(file)
+            return True
+        except Exception:
+            return False
+
     def build(self):
         return False
 
@@ -30,142 +230,218 @@ class Provider(object):
     def create_hook(self, config):
         return False
 
+    def _list_dir(self, path, sha=None):  # 获取单个目录的内容 sha 为列表中目录项携带的版本(如有)
+        return self.get_path(path)["data"]
+
+    def _concurrency(self):  # 当前允许的并发数, 接近请求限额时可以降低
+        return self.concurrency
+
     def get_tree(self, path, depth, exclude=None):  # run if depth >=1
+        # 逐层遍历, 同一层的目录并发获取, 耗时取决于目录深度而不是目录数量
         if not depth:
             return []
         if exclude is None:
             exclude = []
-        path = path.replace("\\", "/")
-        tree = self.get_path(path)["data"]
-        for i in range(len(tree)):
-            if tree[i]["name"] in exclude:
-                continue
-            if tree[i]["type"] == "dir":
-                child = self.get_tree(tree[i]["path"], depth - 1, exclude)
-                tree += child
+        tree = list()
+        level = [(path.replace("\\", "/"), None)]
+        with ThreadPoolExecutor(max_workers=max(self.concurrency, 1)) as pool:
+            while level and depth:
+                if len(level) > 1 and self._concurrency() > 1:  # 在调用方的上下文中执行, 保留后台任务等标记
+                    listings = [future.result() for future in [
+                        pool.submit(contextvars.copy_context().run, self._list_dir, *directory) for directory in level]]
+                else:
+                    listings = (self._list_dir(*directory) for directory in level)
+                level = list()
+                for listing in listings:
+                    tree += listing
+                    level += [(entry["path"], entry.get("sha")) for entry in listing
+                              if entry["type"] == "dir" and entry["name"] not in exclude]
+                depth -= 1
         return tree
 
-    def get_posts(self):
-        _posts = list()
-        _drafts = list()
-        names = list()
-        for path_index in range(len(self.config["drafts"]["path"])):
-            try:
-                drafts = self.get_tree(
-                    self.config["drafts"]["path"][path_index], self.config["drafts"]["depth"][path_index],
-                    self.config["drafts"].get("excludes"))
-                for i in range(len(drafts)):
-                    flag = False
-                    for j in self.config["drafts"]["type"]:
-                        if drafts[i]["path"].endswith(j):
-                            flag = j
-                            break
-                    if drafts[i]["type"] == "file" and flag:
-                        if self.config["drafts"]["path"][path_index] == "":
-                            name = drafts[i]["path"]
-                        else:
-                            name = drafts[i]["path"].split(
-                                self.config["drafts"]["path"][path_index] if self.config["drafts"]["path"][path_index][-1] == "/" else
-                                self.config["drafts"]["path"][path_index] + "/")[1]
-                        name = name[:-len(flag) - (1 if name[-1] == "/" else 0)]
-                        if name.endswith("/"):
-                            name = name[:-1]
-                        _drafts.append({"name": name,
-                                        "fullname": name + flag,
-                                        "path": drafts[i]["path"],
-                                        "size": drafts[i]["size"],
-                                        "status": False})
-
-                        names.append(drafts[i]["path"].split(
-                            self.config["drafts"]["path"][path_index])[1])
-            except Exception as e:
-                logging.error("读取草稿目录 {} 错误: {}，跳过".format(self.config["drafts"]["path"][path_index], repr(e)))
-        for path_index in range(len(self.config["posts"]["path"])):
+    @staticmethod
+    def _filter_tree(entries, path, depth, exclude=None):
+        """
+        从整个仓库的递归文件列表中筛选出与逐级遍历 get_tree(path, depth, exclude) 相同的结果
+        :param entries: [{"type":"dir/file", "name":"文件名", "path":"文件路径", "size":"文件大小(仅文件)"}, ...]
+        """
+        if not depth:
+            return []
+        if exclude is None:
+            exclude = []
+        path = path.replace("\\", "/").strip("/")
+        results = list()
+        for entry in entries:
+            if path and not entry["path"].startswith(path + "/"):
+                continue
+            parts = (entry["path"][len(path) + 1:] if path else entry["path"]).split("/")
+            if 0 < depth < len(parts):
+                continue
+            if any(part in exclude for part in parts[:-1]):
+                continue
+            results.append(entry)
+        return results
+
+    @staticmethod
+    def _covers(outer, inner):
+        # 遍历 outer=(目录, 深度, 排除) 的结果是否包含遍历 inner 所需的全部文件
+        (root, depth, exclude), (sub, sub_depth, sub_exclude) = outer, inner
+        if not sub_depth:
+            return True
+        if not depth or (root and sub != root and not sub.startswith(root + "/")):
+            return False
+        between = [part for part in sub[len(root):].split("/") if part]
+        if any(part in exclude for part in between):
+            return False
+        if depth > 0 and (sub_depth < 0 or depth < len(between) + sub_depth):
+            return False
+        return sub_depth == 1 or set(exclude) <= set(sub_exclude)
+
+    def _walks(self):
+        """posts/drafts/pages/configs 需要的全部遍历, 去掉被其他遍历完全包含的部分"""
+        walks = list()
+        for kind in ("posts", "drafts", "pages", "configs"):
+            for path_index in range(len(self.config[kind]["path"])):
+                walks.append((self.config[kind]["path"][path_index].strip("/"), self.config[kind]["depth"][path_index],
+                              self.config[kind].get("excludes") or []))
+        results = list()
+        for i in range(len(walks)):
+            if not walks[i][1]:
+                continue
+            if not any(j != i and self._covers(walks[j], walks[i]) and (j < i or not self._covers(walks[i], walks[j]))
+                       for j in range(len(walks))):
+                results.append(walks[i])
+        return results
+
+    def _get_entries(self):  # 一次获取整个仓库的递归文件列表, 不支持或结果不完整时返回None
+        return None
+
+    def _get_head(self):  # 当前分支头的提交SHA, 不支持时返回None
+        return None
+
+    def get_snapshot(self, refresh=True):
+        """
+        一次获取 posts/drafts/pages/configs 所需的全部文件, 三个列表均由该快照生成
+        分支头与上次相同时直接返回上次的快照
+        :param refresh: 为False时 距上次检查不足 snapshot_ttl 秒则不检查分支头
+        :return: [{"type":"dir/file", "name":"文件名", "path":"文件路径", "size":"文件大小(仅文件)"}, ...]
+        """
+        if not refresh and self._snapshot[0] is not None and time.monotonic() - self._checked < self.snapshot_ttl:
+            return self._snapshot[1]
+        try:
+            head = self._get_head()
+        except Exception as e:
+            logging.error("读取分支头错误: {}".format(repr(e)))
+            head = None
+        if head is not None and head == self._snapshot[0]:
+            logging.info("分支头未变化, 使用上次的文件树快照")
+            self._checked = time.monotonic()
+            return self._snapshot[1]
+        try:
+            entries = self._get_entries()
+        except Exception as e:
+            logging.error("读取文件树快照错误: {}，改为逐个目录读取".format(repr(e)))
+            entries = None
+        if entries is None:
+            entries = dict()
+            for walk in self._walks():
+                try:
+                    for entry in self.get_tree(*walk):
+                        entries[entry["path"]] = entry
+                except Exception as e:
+                    logging.error("读取目录 {} 错误: {}，跳过".format(walk[0], repr(e)))
+                    head = None  # 快照不完整 下次重新获取
+            entries = list(entries.values())
+        self._snapshot = (head, entries)
+        self._checked = time.monotonic()
+        logging.info("读取文件树快照成功")
+        return entries
+
+    def _make_item(self, kind, path_index, file):
+        # 生成 get_posts/get_pages/get_configs 中的列表项, 不属于该列表时返回None
+        root = self.config[kind]["path"][path_index]
+        flag = False
+        for i in self.config[kind]["type"]:
+            if file["path"].endswith(i):
+                flag = i
+                break
+        if file["type"] != "file" or not flag:
+            return None
+        if kind == "configs":
+            name = file["path"][len(root):]
+            name = name[1:] if name[0] == "/" else name
+            return {"name": name,
+                    "path": file["path"],
+                    "size": file["size"]}
+        if root == "":
+            name = file["path"]
+        else:
+            name = file["path"].split(root if root[-1] == "/" else root + "/")[1]
+        name = name[:-len(flag) - (1 if name[-1] == "/" else 0)]
+        if name.endswith("/"):
+            name = name[:-1]
+        if kind == "pages":
+            return {"name": name,
+                    "path": file["path"],
+                    "size": file["size"]}
+        return {"name": name,
+                "fullname": name + flag,
+                "path": file["path"],
+                "size": file["size"],
+                "status": kind == "posts"}
+
+    def _get_items(self, kind, snapshot=None):
+        results = list()
+        for path_index in range(len(self.config[kind]["path"])):
             try:
-                posts = self.get_tree(
-                    self.config["posts"]["path"][path_index], self.config["posts"]["depth"][path_index],
-                    self.config["posts"].get("excludes"))
-                for i in range(len(posts)):
-                    flag = False
-                    for j in self.config["posts"]["type"]:
-                        if posts[i]["path"].endswith(j):
-                            flag = j
-                            break
-                    if posts[i]["type"] == "file" and flag:
-                        if self.config["posts"]["path"][path_index] == "":
-                            name = posts[i]["path"]
-                        else:
-                            name = posts[i]["path"].split(
-                                self.config["posts"]["path"][path_index] if self.config["posts"]["path"][path_index][-1] == "/" else
-                                self.config["posts"]["path"][path_index] + "/")[1]
-                        name = name[:-len(flag) - (1 if name[-1] == "/" else 0)]
-                        if name.endswith("/"):
-                            name = name[:-1]
-                        _posts.append({"name": name,
-                                       "fullname": name + flag,
-                                       "path": posts[i]["path"],
-                                       "size": posts[i]["size"],
-                                       "status": True})
-                        names.append(posts[i]["path"].split(
-                            self.config["posts"]["path"][path_index])[1])
+                if snapshot is not None:
+                    tree = self._filter_tree(snapshot, self.config[kind]["path"][path_index],
+                                             self.config[kind]["depth"][path_index], self.config[kind].get("excludes"))
+                else:
+                    tree = self.get_tree(self.config[kind]["path"][path_index], self.config[kind]["depth"][path_index],
+                                         self.config[kind].get("excludes"))
+                for file in tree:
+                    item = self._make_item(kind, path_index, file)
+                    if item:
+                        results.append(item)
             except Exception as e:
-                logging.error("读取已发布目录 {} 错误: {}，跳过".format(self.config["posts"]["path"][path_index], repr(e)))
-        posts = _posts + _drafts
+                logging.error("读取{} {} 错误: {}，跳过".format({"posts": "已发布目录", "drafts": "草稿目录", "pages": "页面目录"}.get(kind, "配置"),
+                                                          self.config[kind]["path"][path_index], repr(e)))
+        return results
+
+    def get_item(self, kind, path, size=0):
+        """
+        根据文件路径生成 kind 列表中对应的项目, 用于保存文件后就地修补缓存
+        :param kind: posts/drafts/pages/configs
+        :return: 与完整遍历结果相同的列表项, 文件不在该列表的遍历范围内时返回None
+        """
+        for path_index in range(len(self.config[kind]["path"])):
+            root = self.config[kind]["path"][path_index].strip("/")
+            if root and not path.startswith(root + "/"):
+                continue
+            parts = (path[len(root) + 1:] if root else path).split("/")
+            depth = self.config[kind]["depth"][path_index]
+            if depth != -1 and len(parts) > depth:
+                continue
+            if any(part in (self.config[kind].get("excludes") or []) for part in parts[:-1]):
+                continue
+            item = self._make_item(kind, path_index, {"type": "file", "path": path, "size": size})
+            if item:
+                return item
+        return None
+
+    def get_posts(self, snapshot=None):  # snapshot: get_snapshot() 的结果, 提供时不再访问仓库
+        posts = self._get_items("posts", snapshot) + self._get_items("drafts", snapshot)
         logging.info("读取文章列表成功")
         return posts
 
-    def get_pages(self):
-        results = list()
-        for path_index in range(len(self.config["pages"]["path"])):
-            try:
-                posts = self.get_tree(
-                    self.config["pages"]["path"][path_index], self.config["pages"]["depth"][path_index],
-                    self.config["pages"].get("excludes"))
-                for post in posts:
-                    flag = False
-                    for i in self.config["pages"]["type"]:
-                        if post["path"].endswith(i):
-                            flag = i
-                            break
-                    if post["type"] == "file" and flag:
-                        if self.config["pages"]["path"][path_index] == "":
-                            name = post["path"]
-                        else:
-                            name = post["path"].split(
-                                self.config["pages"]["path"][path_index] if self.config["pages"]["path"][path_index][-1] == "/" else
-                                self.config["pages"]["path"][path_index] + "/")[1]
-                        name = name[:-len(flag) - (1 if name[-1] == "/" else 0)]
-                        if name.endswith("/"):
-                            name = name[:-1]
-                        results.append({"name": name,
-                                        "path": post["path"],
-                                        "size": post["size"]})
-            except Exception as e:
-                logging.error("读取页面目录 {} 错误: {}，跳过".format(self.config["pages"]["path"][path_index], repr(e)))
+    def get_pages(self, snapshot=None):
+        results = self._get_items("pages", snapshot)
         logging.info("读取页面列表成功")
         return results
 
-    def get_configs(self):
-        results = list()
-        for path_index in range(len(self.config["configs"]["path"])):
-            try:
-                posts = self.get_tree(
-                    self.config["configs"]["path"][path_index], self.config["configs"]["depth"][path_index],
-                    self.config["configs"].get("excludes"))
-                for post in posts:
-                    flag = False
-                    for i in self.config["configs"]["type"]:
-                        if post["path"].endswith(i):
-                            flag = True
-                            break
-                    if post["type"] == "file" and flag:
-                        name = post["path"][len(self.config["configs"]["path"][path_index]):]
-                        name = name[1:] if name[0] == "/" else name
-                        results.append({"name": name,
-                                        "path": post["path"],
-                                        "size": post["size"]})
-            except Exception as e:
-                logging.error("读取配置 {} 错误: {}，跳过".format(self.config["configs"]["path"][path_index], repr(e)))
+    def get_configs(self, snapshot=None):
+        results = self._get_items("configs", snapshot)
         logging.info("读取博客配置列表成功")
         return results
 
@@ -183,11 +459,12 @@ class Provider(object):
         if path and (path not in [draft_file, save_file]):
             return [self.save(path, content, f"Save Post {name} by Qexo", autobuild), path, False]
         if status:
-            try:
-                self.delete(draft_file, f"Delete Post Draft {draft_file} by Qexo", False)
-            except:
-                logging.info(f"删除草稿{draft_file}失败, 可能无需删除草稿")
-            return [self.save(save_file, content, f"Publish Post {save_file} by Qexo", autobuild), save_file, draft_file]
+            changes = {save_file: content}
+            if draft_file and draft_file != save_file and self.exists(draft_file):
+                changes[draft_file] = None
+            else:
+                logging.info(f"草稿{draft_file}不存在, 无需删除草稿")
+            return [self.commit(changes, f"Publish Post {save_file} by Qexo", autobuild), save_file, draft_file]
         else:
             if not draft_file:
                 raise Exception("当前配置不支持草稿")
@@ -199,12 +476,10 @@ class Provider(object):
             raise Exception("当前配置不支持草稿")
         post_file = self.config["posts"]["save_path"].replace("${filename}", name)
         if path and path != post_file:
-            draft = self.save_post(name, self.get_content(path), None, False, False)
-            self.delete(path, f"Unpublish Post {name} by Qexo", autobuild)
-        else:
-            draft = self.save_post(name, self.get_content(post_file), None, False, False)
-            self.delete(post_file, f"Unpublish Post {name} by Qexo", autobuild)
-        return draft
+            post_file = path
+        draft_file = self.config["drafts"]["save_path"].replace("${filename}", name)
+        changes = {draft_file: self.get_content(post_file), post_file: None}
+        return [self.commit(changes, f"Unpublish Post {name} by Qexo", autobuild), draft_file, False]
 
     def publish_post(self, name, path=None, autobuild=True):
         if not self.config["drafts"]["save_path"]:
@@ -222,8 +497,7 @@ class Provider(object):
     def rename(self, old, new, autobuild=True):
         if old == new:
             return False
-        self.save(new, self.get_content(old), f"Rename {old} to {new} by Qexo", False)
-        return self.delete(old, f"Rename {old} to {new} by Qexo", autobuild)
+        return self.commit({new: self.get_content(old), old: None}, f"Rename {old} to {new} by Qexo", autobuild)
 
 
 from .providers import _all_providers
@@ -6,3 +6,13 @@ class NoSuchProviderError(QexoProviderException):
     """
     An unknown provider was requests, one that was not registered.
     """
+
+
+class RequestError(QexoProviderException):
+    """
+    The provider's HTTP API answered with a non-2xx status.
+    """
+
+    def __init__(self, status, text):
+        super(RequestError, self).__init__("Request failed: {}".format(text))
+        self.status = status
@@ -1,5 +1,7 @@
 import requests
-from ..core import Provider
+from requests.adapters import HTTPAdapter
+from ..core import Provider, git_blob_sha, POOL_SIZE
+from ..exceptions import RequestError
 import base64
 import logging
 
@@ -14,6 +16,11 @@ class GitEa(Provider):
         self.repo = repo
         self.branch = branch
         self.path = path if path != "/" else ""
+        self._recursive = True  # 旧版本 Gitea 不支持递归获取文件树
+        self._batch = True  # Gitea 1.20 以前不支持在一次提交中修改多个文件
+        self.session = requests.Session()  # 复用连接, 并发请求时共用连接池
+        self.session.mount("http://", HTTPAdapter(pool_maxsize=POOL_SIZE))
+        self.session.mount("https://", HTTPAdapter(pool_maxsize=POOL_SIZE))
 
     params = {'url': {"description": "Gitea 地址", "placeholder": "https://git.example.com"},
               'token': {"description": "Gitea 密钥", "placeholder": "token"},
@@ -28,20 +35,20 @@ class GitEa(Provider):
             "Content-Type": "application/json"
         }
         if method == "GET":
-            res = requests.get(url, headers=headers, params=data)
+            res = self.session.get(url, headers=headers, params=data)
         elif method == "POST":
-            res = requests.post(url, headers=headers, json=data)
+            res = self.session.post(url, headers=headers, json=data)
         elif method == "PUT":
-            res = requests.put(url, headers=headers, json=data)
+            res = self.session.put(url, headers=headers, json=data)
         elif method == "DELETE":
-            res = requests.delete(url, headers=headers, json=data)
+            res = self.session.delete(url, headers=headers, json=data)
         else:
             raise Exception("Method not allowed")
         if not str(res.status_code).startswith("2"):
-            raise Exception("Request failed: {}".format(res.text))
+            raise RequestError(res.status_code, res.text)
         return res
 
-    def get_content(self, file):  # 获取文件内容UTF8
+    def _get_content(self, file):  # 获取文件内容UTF8
         logging.info("获取文件{}".format(file))
         url = "/repos/" + self.repo + "/media/" + self.path + file
         return self.request(url, "GET").text
@@ -75,41 +82,165 @@ class GitEa(Provider):
         logging.info("获取路径{}成功".format(path))
         return {"path": path, "data": results}
 
+    def _get_head(self):
+        return self.request("/repos/" + self.repo + "/branches/" + self.branch, "GET").json()["commit"]["id"]
+
+    def _get_tree_sha(self, path):  # 目录的 tree sha, 根目录直接使用分支名
+        root = (self.path + path).strip("/")
+        if not root:
+            return self.branch
+        parent, name = root.rsplit("/", 1) if "/" in root else ("", root)
+        for file in self.request("/repos/" + self.repo + "/contents/" + parent, "GET", data={"ref": self.branch}).json():
+            if file["type"] == "dir" and file["name"] == name:
+                return file["sha"]
+        raise RequestError(404, "目录{}不存在".format(root))
+
+    def _list_tree(self, path):
+        # 通过 /git/trees/{sha}?recursive=true 分页获取目录下的全部文件, 文件大小来自同一响应 不支持时返回None
+        if not self._recursive:
+            return None
+        root = (self.path + path).strip("/")
+        sha = self._get_tree_sha(path)
+        prefix = root + "/" if root else ""
+        entries = list()
+        page = 1
+        while True:
+            try:
+                res = self.request("/repos/" + self.repo + "/git/trees/" + sha, "GET",
+                                   data={"recursive": "true", "page": page, "per_page": 1000}).json()
+            except Exception as e:
+                logging.error("递归获取文件树失败: {}, 改为逐级获取".format(repr(e)))
+                if isinstance(e, RequestError) and e.status in (404, 405):  # 不支持该接口, 以后都逐级获取 其他错误下次刷新时重试
+                    self._recursive = False
+                return None
+            for file in res.get("tree") or []:
+                full = prefix + file["path"]
+                if not full.startswith(self.path):
+                    continue
+                if file["type"] == "blob":
+                    entries.append({
+                        "name": full.split("/")[-1],
+                        "size": file["size"],
+                        "path": full[len(self.path):],
+                        "type": "file",
+                        "sha": file["sha"]
+                    })
+                if file["type"] == "tree":
+                    entries.append({
+                        "name": full.split("/")[-1],
+                        "path": full[len(self.path):],
+                        "type": "dir"
+                    })
+            if not res.get("truncated") or not res.get("tree"):
+                break
+            page += 1
+        logging.info("获取文件树{}成功".format(root))
+        return entries
+
+    def get_tree(self, path, depth, exclude=None):
+        # 不限深度时递归获取该目录, 限制深度时逐级获取, 不列出遍历范围外的文件
+        if not depth:
+            return []
+        try:
+            entries = self._list_tree(path) if depth == -1 else None
+            if entries is None:
+                return super(GitEa, self).get_tree(path, depth, exclude)
+        except RequestError as e:
+            if e.status != 404:
+                raise
+            return []  # 目录不存在
+        return self._filter_tree(entries, path, depth, exclude)
+
     def save(self, file, content, commitchange="Update by Qexo", autobuild=True):
-        content = base64.b64encode(content.encode()).decode()
+        sha = self._get_sha(file)
+        if sha == git_blob_sha(content):
+            logging.info("文件{}未变化, 跳过保存".format(file))
+            return False
         try:
-            url = "/repos/" + self.repo + "/contents/" + self.path + file
-            data = {'branch': self.branch,
-                    'content': content,
-                    'message': commitchange}
-            self.request(url, "POST", data).json()
-            logging.info("新建文件{}成功".format(file))
-        except:
-            url = "/repos/" + self.repo + "/contents/" + self.path + file
-            data = {'branch': self.branch,
-                    'content': content,
-                    'sha': self.request("/repos/" + self.repo + "/contents/" + self.path + file, "GET").json()["sha"],
-                    'message': commitchange}
-            self.request(url, "PUT", data)
-            logging.info("保存文件{}成功".format(file))
+            res = self._write_file(file, content, commitchange, sha)
+        except RequestError as e:
+            if sha is None or e.status not in (409, 422):
+                raise
+            logging.info("文件{}在快照之后被修改, 重新获取sha".format(file))  # 确认分支头之后又有新的提交
+            res = self._write_file(file, content, commitchange, self._get_sha(file, False))
+        commit = res.json()["commit"]
+        self._record_write({file: content}, commit["sha"], (commit.get("parents") or [{}])[0].get("sha"))
         return False
 
+    def _write_file(self, file, content, commitchange, sha):
+        url = "/repos/" + self.repo + "/contents/" + self.path + file
+        data = {'branch': self.branch,
+                'content': base64.b64encode(content.encode()).decode(),
+                'message': commitchange}
+        if sha:
+            data["sha"] = sha
+            res = self.request(url, "PUT", data)
+            logging.info("保存文件{}成功".format(file))
+        else:
+            res = self.request(url, "POST", data)
+            logging.info("新建文件{}成功".format(file))
+        return res
+
     def delete(self, path, commitchange="Delete by Qexo", autobuild=True):
         file = self.request("/repos/" + self.repo + "/contents/" + self.path + path, "GET").json()
         if type(file) == list:
-            tree = self.get_path(self.path + path)
-            for i in tree["data"]:
-                self.delete(i["path"][len(self.path):], commitchange=commitchange)
+            self.commit({entry["path"]: None for entry in self.get_tree(path, -1) if entry["type"] == "file"},
+                        commitchange, autobuild)
             logging.info("删除目录{}成功".format(path))
         else:
             url = "/repos/" + self.repo + "/contents/" + self.path + path
             data = {'branch': self.branch,
                     'sha': file["sha"],
                     'message': commitchange}
-            self.request(url, "DELETE", data)
+            commit = self.request(url, "DELETE", data).json()["commit"]
+            self._record_write({path: None}, commit["sha"], (commit.get("parents") or [{}])[0].get("sha"))
             logging.info("删除文件{}成功".format(path))
         return False
 
+    def _get_sha(self, file, snapshot=True):  # 文件的 blob sha, 优先使用确认过分支头的文件树快照 不存在时返回None
+        sha = self._get_blob_sha(file, refresh=True) if snapshot else None
+        if sha is not None:
+            return sha
+        try:
+            return self.request("/repos/" + self.repo + "/contents/" + self.path + file, "GET",
+                                data={"ref": self.branch}).json()["sha"]
+        except Exception:
+            return None
+
+    def commit(self, changes, commitchange="Update by Qexo", autobuild=True):
+        # 使用 /contents 批量修改接口在一次提交中完成所有修改, 不支持该接口时逐个保存或删除
+        if not self._batch:
+            return super(GitEa, self).commit(changes, commitchange, autobuild)
+        versions = self._get_blob_shas(refresh=True)  # 确认分支头后再判断文件是否变化
+        files = list()
+        for file, content in changes.items():
+            sha = versions.get(file) or self._get_sha(file, False)
+            if content is not None and sha == git_blob_sha(content):
+                continue
+            if content is None:
+                files.append({"operation": "delete", "path": self.path + file, "sha": sha})
+            elif sha:
+                files.append({"operation": "update", "path": self.path + file, "sha": sha,
+                              "content": base64.b64encode(content.encode()).decode()})
+            else:
+                files.append({"operation": "create", "path": self.path + file,
+                              "content": base64.b64encode(content.encode()).decode()})
+        if not files:
+            logging.info("文件均未变化, 跳过提交")
+            return False
+        try:
+            commit = self.request("/repos/" + self.repo + "/contents", "POST",
+                                  {"branch": self.branch, "message": commitchange, "files": files}).json()["commit"]
+        except RequestError as e:
+            if e.status not in (404, 405):
+                raise
+            logging.info("不支持批量修改接口, 改为逐个提交")
+            self._batch = False
+            return super(GitEa, self).commit(changes, commitchange, autobuild)
+        self._record_write(changes, commit["sha"], (commit.get("parents") or [{}])[0].get("sha"))
+        logging.info("提交{}个文件成功".format(len(changes)))
+        return False
+
     def delete_hooks(self):
         for hook in self.request("/repos/" + self.repo + "/hooks", "GET").json():  # 删除所有HOOK
             self.request("/repos/" + self.repo + "/hooks/" + str(hook["id"]), "DELETE")
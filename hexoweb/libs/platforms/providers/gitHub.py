@@ -1,5 +1,6 @@
 import github
-from ..core import Provider
+from ..core import Provider, git_blob_sha
+from ...ratelimit import get_scheduler, scheduled, is_background
 import logging
 
 
@@ -12,18 +13,24 @@ class Github(Provider):
         self._repo = repo
         self.branch = branch
         self.path = path if path != "/" else ""
-        self.repo = github.Github(self.token).get_repo(self._repo)
+        self.scheduler = get_scheduler(self.token)  # 同一 token 共用客户端与请求额度
+        self.repo = self.scheduler.client.get_repo(self._repo, lazy=True)  # 不在初始化时请求, 第一次调用接口时才访问仓库
+        self._ref = None
+        self._truncated = False  # 文件树过大时只能逐级获取
+        self._trees = dict()  # 目录的 tree sha -> 目录内容, sha 不变则内容不变
 
     params = {'token': {"description": "Github 密钥", "placeholder": "token"},
               'repo': {"description": "Github 仓库", "placeholder": "username/repo"},
               'branch': {"description": "项目分支", "placeholder": "e.g. master"},
               'path': {"description": "博客路径", "placeholder": "留空为根目录"}}
 
-    def get_content(self, file):  # 获取文件内容UTF8
+    @scheduled
+    def _get_content(self, file):  # 获取文件内容UTF8
         logging.info("获取文件{}".format(file))
         content = self.repo.get_contents(self.path + file, self.branch).decoded_content.decode("utf8")
         return content
 
+    @scheduled
     def get_path(self, path):  # 获取目录下的文件列表
         """
         :param path: 目录路径
@@ -52,33 +59,166 @@ class Github(Provider):
         logging.info("获取路径{}成功".format(path))
         return {"path": path, "data": results}
 
+    @scheduled
+    def _get_head(self):
+        if self._ref is None:
+            self._ref = self.repo.get_git_ref("heads/" + self.branch)
+        else:
+            self._ref.update()  # 带 If-None-Match 的条件请求, 未变化时返回304 不计入请求限额
+        return self._ref.object.sha
+
+    @scheduled
+    def _get_entries(self):
+        # 通过 Git Trees API 一次获取整个分支的文件树, 结果被截断时返回None
+        if self._truncated:
+            return None
+        tree = self.repo.get_git_tree(self.branch, recursive=True)
+        if tree.raw_data.get("truncated"):
+            logging.info("文件树过大被截断, 改为逐级获取")
+            self._truncated = True
+            return None
+        entries = list()
+        for file in tree.tree:
+            if not file.path.startswith(self.path) or file.type not in ("blob", "tree"):
+                continue
+            if file.type == "blob":
+                entries.append({
+                    "name": file.path.split("/")[-1],
+                    "size": file.size,
+                    "path": file.path[len(self.path):],
+                    "type": "file",
+                    "sha": file.sha
+                })
+            else:
+                entries.append({
+                    "name": file.path.split("/")[-1],
+                    "path": file.path[len(self.path):],
+                    "type": "dir"
+                })
+        logging.info("获取文件树成功")
+        return entries
+
+    def get_tree(self, path, depth, exclude=None):
+        if not depth:
+            return []
+        entries = None if self._truncated else self._get_entries()
+        if entries is None:
+            return super(Github, self).get_tree(path, depth, exclude)
+        return self._filter_tree(entries, path, depth, exclude)
+
+    def _concurrency(self):  # 后台任务或额度紧张时逐个获取
+        remaining = self.scheduler.budget[0]
+        if is_background() or 0 <= remaining <= self.scheduler.reserve * 2:
+            return 1
+        return self.concurrency
+
+    @scheduled
+    def _list_dir(self, path, sha=None):
+        # 逐级获取时子目录的 tree sha 未变化则直接使用上次的结果
+        if sha and sha in self._trees:
+            return self._trees[sha]
+        path = (self.path + path.replace("\\", "/")).strip("/")
+        results = list()
+        for file in self.repo.get_contents(path, self.branch):
+            if file.type == "file":
+                results.append({
+                    "name": file.name,
+                    "size": file.size,
+                    "path": file.path if not file.path.startswith(self.path) else file.path[len(self.path):],
+                    "type": "file",
+                    "sha": file.sha
+                })
+            if file.type == "dir":
+                results.append({
+                    "name": file.name,
+                    "path": file.path if not file.path.startswith(self.path) else file.path[len(self.path):],
+                    "type": "dir",
+                    "sha": file.sha
+                })
+        if sha:
+            if len(self._trees) > 4096:
+                self._trees.clear()
+            self._trees[sha] = results
+        logging.info("获取路径{}成功".format(path))
+        return results
+
+    @scheduled
     def save(self, file, content, commitchange="Update by Qexo", autobuild=True):
+        sha = self._get_blob_sha(file, refresh=True)  # 确认分支头后使用文件树快照中的 sha, 省去一次查询
+        if sha == git_blob_sha(content):
+            logging.info("文件{}未变化, 跳过保存".format(file))
+            return False
         try:
-            self.repo.update_file(self.path + file, commitchange, content,
-                                  self.repo.get_contents(self.path + file, ref=self.branch).sha, branch=self.branch)
+            res = self._write_file(file, content, commitchange, sha)
+        except github.GithubException as e:
+            if sha is None or e.status != 409:
+                raise
+            logging.info("文件{}在快照之后被修改, 重新获取sha".format(file))  # 确认分支头之后又有新的提交
+            res = self._write_file(file, content, commitchange, None)
+        self._record_write({file: content}, res["commit"].sha, res["commit"].parents[0].sha)
+        return False  # 返回False表示没有进行自动部署
+
+    def _write_file(self, file, content, commitchange, sha):
+        if sha is None:
+            try:
+                sha = self.repo.get_contents(self.path + file, ref=self.branch).sha
+            except github.UnknownObjectException:
+                sha = None
+        if sha:
+            res = self.repo.update_file(self.path + file, commitchange, content, sha, branch=self.branch)
             logging.info("保存文件{}成功".format(file))
-        except:
-            self.repo.create_file(self.path + file, commitchange, content, branch=self.branch)
+        else:
+            res = self.repo.create_file(self.path + file, commitchange, content, branch=self.branch)
             logging.info("新建文件{}成功".format(file))
-        return False  # 返回False表示没有进行自动部署
+        return res
 
+    @scheduled
     def delete(self, path, commitchange="Delete by Qexo", autobuild=True):
         file = self.repo.get_contents(self.path + path, ref=self.branch)
         if not isinstance(file, list):
-            self.repo.delete_file(self.path + path, commitchange, file.sha, branch=self.branch)
+            res = self.repo.delete_file(self.path + path, commitchange, file.sha, branch=self.branch)
+            self._record_write({path: None}, res["commit"].sha, res["commit"].parents[0].sha)
             logging.info("删除文件{}成功".format(path))
         else:
-            for i in file:
-                self.delete(i.path[len(self.path):], commitchange)
+            self.commit({entry["path"]: None for entry in self.get_tree(path, -1) if entry["type"] == "file"},
+                        commitchange, autobuild)
             logging.info("删除目录{}成功".format(path))
         return False
 
+    @scheduled
+    def commit(self, changes, commitchange="Update by Qexo", autobuild=True):
+        # 通过 Git Data API 以分支头为父提交创建新的树和提交, 然后更新分支, 所有修改只产生一次提交
+        ref = self.repo.get_git_ref("heads/" + self.branch)
+        versions = self._get_blob_shas(refresh=True)
+        if self._snapshot[0] != ref.object.sha:  # 快照与将要作为父提交的分支头不一致, 不跳过任何文件
+            versions = dict()
+        elements = list()
+        for file, content in changes.items():
+            if content is not None and versions.get(file) == git_blob_sha(content):
+                continue
+            if content is None:
+                elements.append(github.InputGitTreeElement(self.path + file, "100644", "blob", sha=None))
+            else:
+                elements.append(github.InputGitTreeElement(self.path + file, "100644", "blob", content=content))
+        if not elements:
+            logging.info("文件均未变化, 跳过提交")
+            return False
+        parent = self.repo.get_git_commit(ref.object.sha)
+        tree = self.repo.create_git_tree(elements, parent.tree)
+        head = self.repo.create_git_commit(commitchange, tree, [parent]).sha
+        ref.edit(head)
+        self._record_write(changes, head, parent.sha)
+        logging.info("提交{}个文件成功".format(len(changes)))
+        return False
+
+    @scheduled
     def delete_hooks(self):
         for hook in self.repo.get_hooks():  # 删除所有HOOK
             hook.delete()
         logging.info("删除所有WebHook成功")
         return True
 
+    @scheduled
     def create_hook(self, url):
         config = {
             "content_type": "json",
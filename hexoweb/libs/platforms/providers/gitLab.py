@@ -1,5 +1,5 @@
 import gitlab
-from ..core import Provider
+from ..core import Provider, git_blob_sha
 import logging
 
 class Gitlab(Provider):
@@ -12,7 +12,9 @@ class Gitlab(Provider):
         self._repo = repo
         self.branch = branch
         self.path = path if path != "/" else ""
-        self.repo = (gitlab.Gitlab(url=url, private_token=token) if url else gitlab.Gitlab(private_token=token)).projects.get(repo)
+        # lazy: 不在初始化时请求, 第一次调用接口时才访问仓库
+        self.repo = (gitlab.Gitlab(url=url, private_token=token) if url else gitlab.Gitlab(private_token=token)).projects.get(repo, lazy=True)
+        self._full_path = None
 
     params = {'url': {"description": "Gitlab 地址", "placeholder": "留空为官网"},
               'token': {"description": "Gitlab 密钥", "placeholder": "token"},
@@ -20,7 +22,7 @@ class Gitlab(Provider):
               'branch': {"description": "项目分支", "placeholder": "e.g. master"},
               'path': {"description": "博客路径", "placeholder": "留空为根目录"}}
 
-    def get_content(self, file):  # 获取文件内容UTF8
+    def _get_content(self, file):  # 获取文件内容UTF8
         logging.info("获取文件{}".format(file))
         content = self.repo.files.get(self.path + file, ref=self.branch).decode().decode("utf8")
         return content
@@ -35,14 +37,16 @@ class Gitlab(Provider):
         """
         results = list()
         path = self.path + path
-        contents = self.repo.repository_tree(path[:-1] if path.endswith("/") else path, ref=self.branch, get_all=True)
+        contents = self.repo.repository_tree(path[:-1] if path.endswith("/") else path, ref=self.branch, get_all=True,
+                                             per_page=100)
         for file in contents:
             if file["type"] == "blob":
                 results.append({
                     "name": file["name"],
                     "size": 0,
                     "path": file["path"] if not file["path"].startswith(self.path) else file["path"][len(self.path):],
-                    "type": "file"
+                    "type": "file",
+                    "sha": file["id"]
                 })
             if file["type"] == "tree":
                 results.append({
@@ -53,28 +57,102 @@ class Gitlab(Provider):
         logging.info("获取路径{}成功".format(path))
         return {"path": path, "data": results}
 
-    def save(self, file, content, commitchange="Update by Qexo", autobuild=True):
+    def _get_head(self):
+        return self.repo.branches.get(self.branch).commit["id"]
+
+    def _list_tree(self, path):
+        # 使用 recursive 分页获取目录下的全部文件, 不包含文件大小
+        root = (self.path + path.replace("\\", "/")).strip("/")
+        entries = list()
+        for file in self.repo.repository_tree(root, ref=self.branch, recursive=True, get_all=True, per_page=100):
+            if file["type"] == "blob":
+                entries.append({
+                    "name": file["name"],
+                    "size": 0,
+                    "path": file["path"] if not file["path"].startswith(self.path) else file["path"][len(self.path):],
+                    "type": "file",
+                    "sha": file["id"]
+                })
+            if file["type"] == "tree":
+                entries.append({
+                    "name": file["name"],
+                    "path": file["path"] if not file["path"].startswith(self.path) else file["path"][len(self.path):],
+                    "type": "dir"
+                })
+        logging.info("获取文件树{}成功".format(root))
+        return entries
+
+    def get_tree(self, path, depth, exclude=None):
+        # 不限深度时一次递归获取, 限制深度时逐级获取, 不列出遍历范围外的文件
+        # 快照由各 _walks() 目录的遍历结果组成, 只为这些文件查询大小
+        if not depth:
+            return []
         try:
-            f = self.repo.files.create({'file_path': self.path + file,
-                          'branch': self.branch,
-                          'content': content,
-                          'commit_message': commitchange})
-            logging.info("新建文件{}成功".format(file))
-        except:
-            f = self.repo.files.get(file_path=self.path + file, ref=self.branch)
-            f.content = content
-            f.save(branch=self.branch, commit_message=commitchange)
-            logging.info("保存文件{}成功".format(file))
-        return False
+            if depth == -1:
+                results = self._filter_tree(self._list_tree(path), path, depth, exclude)
+            else:
+                results = super(Gitlab, self).get_tree(path, depth, exclude)
+        except gitlab.GitlabGetError as e:
+            if e.response_code != 404:
+                raise
+            return []  # 目录不存在
+        self._fill_sizes([entry for entry in results if entry["type"] == "file"])
+        return results
+
+    def _fill_sizes(self, files, chunk=100):
+        # REST 接口的目录树不包含文件大小, 每次最多查询 chunk 个文件 失败时保持为0
+        query = """query($project: ID!, $ref: String!, $paths: [String!]!) {
+  project(fullPath: $project) { repository { blobs(ref: $ref, paths: $paths, first: %d) { nodes { path size } } } }
+}""" % chunk
+        gl = self.repo.manager.gitlab
+        try:
+            if self._full_path is None:  # 仓库以数字ID配置时才需要查询完整路径
+                self._full_path = self._repo if not str(self._repo).isdigit() else \
+                    self.repo.manager.get(self._repo).path_with_namespace
+            for i in range(0, len(files), chunk):
+                batch = {self.path + file["path"]: file for file in files[i:i + chunk]}
+                res = gl.http_post(gl.url + "/api/graphql", post_data={
+                    "query": query,
+                    "variables": {"project": self._full_path, "ref": self.branch,
+                                  "paths": list(batch.keys())}})
+                for blob in res["data"]["project"]["repository"]["blobs"]["nodes"]:
+                    if blob["path"] in batch:
+                        batch[blob["path"]]["size"] = int(blob["size"] or 0)
+        except Exception as e:
+            logging.error("获取文件大小失败: {}".format(repr(e)))
+
+    def save(self, file, content, commitchange="Update by Qexo", autobuild=True):
+        # 与批量提交相同使用 commits API, 可以从返回的提交得到新的分支头
+        return self.commit({file: content}, commitchange, autobuild)
 
     def delete(self, path, commitchange="Delete by Qexo", autobuild=True):
         try:
             file = self.repo.files.get(file_path=self.path + path, ref=self.branch)
             file.delete(commit_message=commitchange, branch=self.branch)
+            self._record_write({path: None})  # 接口不返回提交, 下次读取时重新检查分支头
             logging.info("删除文件{}成功".format(path))
         except:
-            tree = self.get_path(self.path + path)
-            for i in tree["data"]:
-                self.delete(i["path"][len(self.path):], commitchange=commitchange)
+            self.commit({entry["path"]: None for entry in self.get_tree(path, -1) if entry["type"] == "file"},
+                        commitchange, autobuild)
             logging.info("删除目录{}成功".format(path))
         return False
+
+    def commit(self, changes, commitchange="Update by Qexo", autobuild=True):
+        # 使用 commits API 的 actions 在一次提交中完成所有修改
+        versions = self._get_blob_shas(refresh=True)  # 确认分支头后再判断文件是否变化
+        actions = list()
+        for file, content in changes.items():
+            sha = versions.get(file)
+            if content is None:
+                actions.append({"action": "delete", "file_path": self.path + file})
+            elif sha != git_blob_sha(content):
+                actions.append({"action": "update" if sha or self.exists(file) else "create",
+                                "file_path": self.path + file,
+                                "content": content})
+        if not actions:
+            logging.info("文件均未变化, 跳过提交")
+            return False
+        res = self.repo.commits.create({"branch": self.branch, "commit_message": commitchange, "actions": actions})
+        self._record_write(changes, res.id, (res.parent_ids or [None])[0])
+        logging.info("提交{}个文件成功".format(len(changes)))
+        return False
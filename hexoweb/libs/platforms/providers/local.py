@@ -1,25 +1,44 @@
 from ..core import Provider
 import os
 import subprocess
+import threading
 import logging
 
 
 class Local(Provider):
     name = "本地"
 
-    def __init__(self, path, config, auto=False):
+    def __init__(self, path, config, auto=False, watch=False):
         super(Local, self).__init__(config)
         self.path = path
         self.auto = auto
+        self.interval = float(watch) if watch else 0
+        self._index = None  # 文件路径 -> (修改时间, 大小)
+        self._stop = threading.Event()
 
     params = {"path": {"description": "博客路径", "placeholder": "博客源码的绝对路径"},
-              "auto": {"description": "自动部署", "placeholder": "自动部署命令 留空不开启"}}
+              "auto": {"description": "自动部署", "placeholder": "自动部署命令 留空不开启"},
+              "watch": {"description": "监视文件变化", "placeholder": "轮询间隔(秒) 留空不开启"}}
 
-    def get_content(self, file):  # 获取文件内容UTF8
+    def _get_content(self, file):  # 获取文件内容UTF8
         with open(os.path.join(self.path, file), 'r', encoding='UTF-8') as f:
             logging.info("获取文件{}成功".format(os.path.join(self.path, file)))
             return f.read()
 
+    def _get_version(self, file, refresh=False):  # 修改时间与大小 每次都读取最新状态
+        try:
+            stat = os.stat(os.path.join(self.path, file))
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def get_versions(self, files):  # 本地没有 blob sha, 使用修改时间与大小
+        results = dict()
+        for file in files:
+            version = self._get_version(file)
+            results[file] = "{}-{}".format(*version) if version is not None else None
+        return results
+
     def get_path(self, path):  # 获取目录下的文件列表
         """
         :param path: 目录路径
@@ -49,8 +68,78 @@ class Local(Provider):
         logging.info("获取路径{}成功".format(path))
         return {"path": path, "data": results}
 
+    def get_tree(self, path, depth, exclude=None):
+        # 使用 os.scandir 遍历, 直接复用 DirEntry 中缓存的类型与大小
+        if not depth:
+            return []
+        if exclude is None:
+            exclude = []
+        path = path.replace("\\", "/").strip("/")
+        results = list()
+        with os.scandir(os.path.join(self.path, path)) as it:
+            for entry in it:
+                file = path + "/" + entry.name if path else entry.name
+                if entry.is_dir():
+                    results.append({"name": entry.name, "path": file, "type": "dir"})
+                    if entry.name not in exclude:
+                        results += self.get_tree(file, depth - 1, exclude)
+                else:
+                    results.append({"name": entry.name, "size": entry.stat().st_size, "path": file, "type": "file"})
+        logging.info("获取路径{}成功".format(path))
+        return results
+
+    def _scan(self):
+        index = dict()
+        for walk in self._walks():
+            try:
+                for entry in self.get_tree(*walk):
+                    if entry["type"] == "file":
+                        stat = os.stat(os.path.join(self.path, entry["path"]))
+                        index[entry["path"]] = (stat.st_mtime_ns, stat.st_size)
+            except FileNotFoundError:
+                continue
+        return index
+
+    def watch(self, callback, elect=None):
+        """
+        定时比对文件的修改时间与大小, 发现 Qexo 以外的修改(如 git pull 或编辑器保存)时调用
+        callback(saved={路径: 大小}, deleted=[路径])
+        :param elect: 每次比对前调用 elect(ttl), 返回False时本轮不比对 用于多个进程中只保留一个监视者,
+                      ttl 为监视者失去响应后其他进程接替前的秒数
+        """
+        if not self.interval:
+            return False
+        self._index = self._scan()
+
+        def worker():
+            while not self._stop.wait(self.interval):
+                try:
+                    if elect is not None and not elect(self.interval * 3):
+                        continue
+                    index = self._scan()
+                    saved = {path: stat[1] for path, stat in index.items() if self._index.get(path) != stat}
+                    deleted = [path for path in self._index if path not in index]
+                    self._index = index
+                    if saved or deleted:
+                        logging.info("检测到文件变化: {}".format(list(saved) + deleted))
+                        callback(saved=saved, deleted=deleted)
+                except Exception as e:
+                    logging.error("监视文件变化错误: {}".format(repr(e)))
+
+        threading.Thread(target=worker, name="qexo-local-watcher", daemon=True).start()
+        logging.info("开始监视{}的文件变化".format(self.path))
+        return True
+
+    def stop(self):
+        self._stop.set()
+
     def save(self, file, content, commitchange="Update by Qexo", autobuild=True):
         path = os.path.join(self.path, file).replace("\\", "/")
+        if os.path.isfile(path) and os.path.getsize(path) == len(content.encode("utf8")):
+            with open(path, "r", encoding="UTF-8", newline="") as f:
+                if f.read() == content:
+                    logging.info("文件{}未变化, 跳过保存".format(file))
+                    return False
         if not os.path.exists("/".join(path.split("/")[0:-1])):
             os.makedirs("/".join(path.split("/")[0:-1]))
         with open(path, "w", encoding="UTF-8") as f:
@@ -0,0 +1,7 @@
+from .core import split_front_matter
+from .core import parse_article
+from .core import excerpt
+from .core import parse_post
+from .core import bulk_parse
+
+__all__ = ['split_front_matter', 'parse_article', 'excerpt', 'parse_post', 'bulk_parse']
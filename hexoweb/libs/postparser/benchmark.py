@@ -0,0 +1,151 @@
+"""
+文章解析的基准测试 不依赖 Django
+python -m hexoweb.libs.postparser.benchmark [文章数] [单次请求延迟(毫秒)]
+
+1. Front-matter 解析器: 旧版 get_post_details / parse_article, 在同一组文章上比较单次耗时, 并检查结果一致
+用线程池模拟并发获取文章内容, 比较:
+2. 索引(只解析 Front-matter): 全部获取后再解析 / 边获取边解析
+3. 摘要与字数: 全部获取后再解析 / 边获取边交给 bulk_parse
+4. 解析本身: 当前进程 / 多个进程 (仅在多核时有意义)
+"""
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
+import timeit
+import json
+import time
+import yaml
+import sys
+import re
+import os
+
+from .core import parse_article, bulk_parse
+
+FETCH_WORKERS = 8
+PLACEHOLDERS = {"date": "2024-01-01T00:00:00+08:00", "abbrlink": "1a2b3c4d"}
+
+
+def make_posts(count):
+    body = "\n\n".join("## 第{0}节\n\n这是第{0}段正文, 包含 **加粗**、`代码` 与 [链接](https://example.com/{0}).\n\n"
+                       "![图片{0}](https://example.com/{0}.png)\n\n- 列表一\n- 列表二\n\n"
+                       "Some English words to count in section {0}.".format(i) for i in range(20))
+    return [("source/_posts/{}.md".format(i),
+             "---\ntitle: 文章{0}\ndate: 2024-01-01 00:00:00\ntags: [a, b]\ncategories: [c]\n---\n{1}".format(i, body))
+            for i in range(count)]
+
+
+def legacy_post_details(article, safe=True):
+    # 旧版 functions.get_post_details, 去掉了读取设置与日志, 占位符使用固定值以便比较结果
+    flag = False
+    if not (article.startswith("---") or article.startswith(";;;")):
+        flag = True
+        if ";;;" in article:
+            article = ";;;\n" + article
+        elif "---" in article:
+            article = "---\n" + article
+        else:
+            flag = False
+    abbrlink = PLACEHOLDERS["abbrlink"]
+    dateformat = PLACEHOLDERS["date"]
+    try:
+        if article[:3] == "---":
+            front_matter = re.search(r"---([\s\S]*?)---", article, flags=0).group()[3:-4]
+            front_matter = front_matter.replace("{{ date }}", dateformat).replace("{{ abbrlink }}", abbrlink).replace(
+                "{{ slug }}", abbrlink).replace("{", "").replace("}", "")
+            front_matter = yaml.safe_load(front_matter)
+        elif article[:3] == ";;;":
+            front_matter = json.loads("{{{}}}".format(
+                re.search(r";;;([\s\S]*?);;;", article, flags=0).group()[3:-4].replace("{{ date }}", dateformat)
+                .replace("{{ abbrlink }}", abbrlink).replace("{{ slug }}", abbrlink)))
+        else:
+            front_matter = {}
+    except Exception:
+        if flag:
+            article = article[3:]
+        return {}, repr(article).replace("<", "\\<").replace(">", "\\>").replace("!", "\\!") if safe else article
+    if not isinstance(front_matter, dict) or not front_matter:
+        front_matter = {}
+        if flag:
+            article = article[3:]
+        passage = repr(article).replace("<", "\\<").replace(">", "\\>").replace("!", "\\!") if safe else article
+    else:
+        for key in front_matter.keys():
+            if type(front_matter.get(key)) == datetime:
+                front_matter[key] = front_matter[key].astimezone().isoformat()
+            elif type(front_matter.get(key)) == date:
+                front_matter[key] = front_matter[key].isoformat()
+        if safe:
+            passage = repr(re.search(r"[;-][;-][;-]([\s\S]*)", article[3:], flags=0).group()[3:]).replace(
+                "<", "\\<").replace(">", "\\>").replace("!", "\\!")
+        else:
+            passage = re.search(r"[;-][;-][;-]([\s\S]*)", article[3:], flags=0).group()[3:]
+    return front_matter, passage
+
+
+def post_details(article, safe=True):  # 现在的 functions.get_post_details
+    front_matter, passage, _ = parse_article(article, PLACEHOLDERS)
+    return front_matter, repr(passage).replace("<", "\\<").replace(">", "\\>").replace("!", "\\!") if safe else passage
+
+
+def per_call(func, article, safe):  # 单次调用的耗时(毫秒), 取多轮中最快的一轮
+    number = max(1, int(2000 / (len(article) / 1000 + 10)))
+    return min(timeit.repeat(lambda: func(article, safe), number=number, repeat=5)) / number * 1000
+
+
+def compare_parsers(posts):
+    small = posts[0][1]
+    large = small + small.split("\n---\n", 1)[1] * 59  # 同样的 Front-matter, 60 倍的正文
+    corpus = [("小文章", small), ("大文章 ({:.0f}KB)".format(len(large.encode("utf8")) / 1024), large)]
+    for content in [content for _, content in posts] + [large]:
+        for safe in (True, False):
+            assert legacy_post_details(content, safe) == post_details(content, safe), "解析结果不一致"
+    print("{:<28}{:>10}{:>14}{:>9}".format("", "旧版", "parse_article", "加速"))
+    for name, article in corpus:
+        for safe in (True, False):
+            before, after = per_call(legacy_post_details, article, safe), per_call(post_details, article, safe)
+            print("{:<28}{:>8.3f}ms{:>12.3f}ms{:>8.2f}x".format(
+                "{} {}".format(name, "转义" if safe else "原文"), before, after, before / after))
+
+
+def fetched(posts, latency):  # 模拟并发请求, 按输入顺序边获取边产出
+    def fetch(post):
+        time.sleep(latency)
+        return post
+
+    with ThreadPoolExecutor(max_workers=FETCH_WORKERS) as pool:
+        yield from pool.map(fetch, posts)
+
+
+def measure(func):
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def report(name, before, after):
+    print("{:<28}{:>9.3f}s{:>9.3f}s{:>8.2f}x".format(name, before, after, before / after))
+
+
+def main(count=200, latency=0.1):
+    posts = make_posts(count)
+    print("{} 篇文章, 单次请求 {:.0f}ms, {} 个并发请求, {} 个 CPU, YAML 解析器 {}".format(
+        count, latency * 1000, FETCH_WORKERS, os.cpu_count(), "libyaml" if yaml.__with_libyaml__ else "纯 Python"))
+    compare_parsers(posts)
+    print("{:<28}{:>10}{:>10}{:>9}".format("", "先获取", "流式", "加速"))
+    report("索引 (Front-matter)",
+           measure(lambda: [parse_article(content) for _, content in list(fetched(posts, latency))]),
+           measure(lambda: [parse_article(content) for _, content in fetched(posts, latency)]))
+    report("摘要与字数",
+           measure(lambda: list(bulk_parse(list(fetched(posts, latency)), workers=1))),
+           measure(lambda: list(bulk_parse(fetched(posts, latency), workers=1))))
+    workers = os.cpu_count() or 1
+    if workers > 1:
+        print("{:<28}{:>10}{:>10}{:>9}".format("", "单进程", "多进程", "加速"))
+        report("解析 (摘要与字数)",
+               measure(lambda: list(bulk_parse(posts, workers=1))),
+               measure(lambda: list(bulk_parse(posts, workers=workers))))
+    else:
+        print("只有一个 CPU, 跳过多进程解析的比较")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) if i == 0 else float(arg) / 1000 for i, arg in enumerate(sys.argv[1:3])))
@@ -0,0 +1,191 @@
+"""
+文章解析 不依赖 Django, 可以在子进程中运行
+"""
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from collections import deque
+from datetime import date, datetime
+from itertools import islice
+from bs4 import BeautifulSoup
+from markdown import markdown
+import multiprocessing
+import logging
+import json
+import yaml
+import os
+import re
+
+try:  # libyaml 可用时使用 C 实现的解析器
+    YamlLoader = yaml.CSafeLoader
+except AttributeError:
+    YamlLoader = yaml.SafeLoader
+
+try:  # Python 3.11 起自带, 更早的版本不解析 TOML Front-matter
+    import tomllib
+except ImportError:
+    tomllib = None
+
+FRONT_MATTER_SEPARATORS = ("---", ";;;", "+++")  # YAML / JSON / TOML(Hugo)
+_PLACEHOLDERS = re.compile(r"{{ (date|abbrlink|slug) }}")
+_YAML_PLACEHOLDERS = re.compile(r"{{ (date|abbrlink|slug) }}|[{}]")  # 同时去掉其他模板变量的花括号
+_IMAGES = re.compile(r"!\[[^\]]*\]\(\s*<?([^)\s>]+)|<img\s[^>]*?src\s*=\s*[\"']([^\"']+)", re.I)
+_CJK = "\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af"  # 假名、汉字、谚文
+_WORDS = re.compile("[" + _CJK + r"]|[^\W" + _CJK + "]+")
+
+
+def split_front_matter(article):
+    """
+    一次扫描拆分 Front-matter 与正文, 结束分隔符需要单独成行
+    :return: (分隔符, Front-matter, 正文) 正文从结束分隔符之后开始, 没有 Front-matter 时返回 (None, "", article)
+    """
+    separator = article[:3]
+    if separator not in FRONT_MATTER_SEPARATORS:
+        return None, "", article
+    position = 2
+    while True:
+        position = article.find("\n" + separator, position + 1)
+        if position == -1:
+            return None, "", article
+        end = position + 4
+        line_end = article.find("\n", end)
+        if not article[end:line_end if line_end != -1 else len(article)].strip():
+            return separator, article[3:position], article[end:]
+
+
+def _fill_placeholders(front_matter, pattern, placeholders):
+    # 替换脚手架中的 {{ date }} {{ abbrlink }} {{ slug }}, 只在出现时取值
+    # placeholders: {"date": 值, "abbrlink": 值} 或 根据名称返回值的函数
+    values = dict()
+
+    def replace(match):
+        name = match.group(1)
+        if name is None:
+            return ""
+        name = "date" if name == "date" else "abbrlink"
+        if name not in values:
+            if callable(placeholders):
+                values[name] = placeholders(name)
+            else:
+                values[name] = (placeholders or dict()).get(name, "")
+        return values[name]
+
+    return pattern.sub(replace, front_matter)
+
+
+def parse_article(article, placeholders=None):
+    """
+    解析 Front-matter
+    :return: (Front-matter, 正文, 解析结果) Front-matter 无效时为{} 且正文为全文, 解析出错时解析结果为None
+    """
+    flag = False
+    if not article.startswith(FRONT_MATTER_SEPARATORS):  # 省略了开头的分隔符
+        for separator in (";;;", "---"):
+            if separator in article:
+                article = separator + "\n" + article
+                flag = True
+                break
+    separator, front_matter, passage = split_front_matter(article)
+    try:
+        if separator == "---":
+            front_matter = yaml.load(_fill_placeholders(front_matter, _YAML_PLACEHOLDERS, placeholders),
+                                     Loader=YamlLoader)
+        elif separator == ";;;":
+            front_matter = json.loads("{{{}}}".format(_fill_placeholders(front_matter, _PLACEHOLDERS, placeholders)))
+        elif separator == "+++" and tomllib:
+            front_matter = tomllib.loads(_fill_placeholders(front_matter, _PLACEHOLDERS, placeholders))
+        else:
+            front_matter = {}
+    except Exception:
+        front_matter = None
+    if not isinstance(front_matter, dict) or not front_matter:
+        return {}, article[3:] if flag else article, front_matter
+    for key in front_matter.keys():
+        if type(front_matter.get(key)) == datetime:
+            front_matter[key] = front_matter[key].astimezone().isoformat()
+        elif type(front_matter.get(key)) == date:
+            front_matter[key] = front_matter[key].isoformat()
+    return front_matter, passage, front_matter
+
+
+def _plain_text(content, mark=True):  # 渲染后的纯文本, 忽略脚本与样式
+    result, content = "", (markdown(content) if mark else content)
+    soup = BeautifulSoup(content, 'html.parser')
+    for dom in soup:
+        if dom.name and dom.name not in ["script", "style"]:
+            result += re.sub("{(.*?)}", '', dom.get_text()).replace("\n", " ")
+            result += "" if result.endswith(" ") else " "
+    return result
+
+
+def _truncate(text, length):
+    return text[:int(length)] + "..." if (len(text) if text else 0) > int(length) else text
+
+
+def excerpt(content, length, mark=True):
+    if content is None:
+        content = ""
+    return _truncate(_plain_text(content, mark), length)
+
+
+def parse_post(path, content, excerpt_length=200, placeholders=None):
+    """
+    解析单篇文章
+    :param excerpt_length: 摘要长度, 为0时不渲染正文, 不生成摘要与字数
+    :return: {"path": 路径, "front_matter": {...}, "body": 正文, "excerpt": 摘要, "words": 字数, "images": [图片地址]}
+    """
+    front_matter, body, _ = parse_article(content or "", placeholders)
+    record = {"path": path, "front_matter": front_matter, "body": body, "excerpt": None, "words": None,
+              "images": list(dict.fromkeys(markdown_url or html_url for markdown_url, html_url in _IMAGES.findall(body)))}
+    if excerpt_length:
+        text = _plain_text(body)
+        record["excerpt"] = _truncate(text, excerpt_length)
+        record["words"] = len(_WORDS.findall(text))  # 中日韩文字按字计数, 其他按词计数
+    return record
+
+
+def _parse_chunk(chunk, excerpt_length, placeholders):
+    return [parse_post(path, content, excerpt_length, placeholders) for path, content in chunk]
+
+
+def bulk_parse(files, excerpt_length=200, placeholders=None, workers=None, chunk_size=32):
+    """
+    使用多个进程解析大量文章, 边读取边解析, 每个进程一次处理 chunk_size 篇
+    文章数不足一批或无法创建子进程时在当前进程中解析
+    :param files: 可迭代的 (路径, 内容), 可以是生成器
+    :param placeholders: 脚手架占位符的值 {"date": 值, "abbrlink": 值}, 需要传给子进程因此不能是函数
+    :return: 按输入顺序产出 parse_post 记录的生成器
+    """
+    files = iter(files)
+    workers = workers or os.cpu_count() or 1
+    chunk = list(islice(files, chunk_size))
+    pool = None
+    if workers > 1 and len(chunk) == chunk_size:
+        try:
+            # spawn: 子进程不继承数据库连接与后台线程
+            pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+        except (OSError, NotImplementedError, ImportError) as e:  # 部分 Serverless 环境不支持多进程
+            logging.warning("无法创建解析进程, 改为在当前进程中解析: {}".format(repr(e)))
+    if pool is None:
+        while chunk:
+            yield from _parse_chunk(chunk, excerpt_length, placeholders)
+            chunk = list(islice(files, chunk_size))
+        return
+    with pool:
+        pending = deque()
+        while chunk or pending:
+            while chunk and len(pending) < workers * 2:  # 限制已提交的批次, 不一次读入全部文章
+                try:
+                    future = pool.submit(_parse_chunk, chunk, excerpt_length, placeholders)
+                except BrokenProcessPool:
+                    future = None
+                pending.append((chunk, future))
+                chunk = list(islice(files, chunk_size))
+            current, future = pending.popleft()
+            try:
+                records = future.result() if future is not None else None
+            except BrokenProcessPool:
+                records = None
+            if records is None:  # 子进程异常退出, 该批在当前进程中解析
+                logging.warning("解析进程异常退出, 改为在当前进程中解析")
+                records = _parse_chunk(current, excerpt_length, placeholders)
+            yield from records
@@ -0,0 +1,9 @@
+from .core import background
+from .core import is_background
+from .core import get_scheduler
+from .core import scheduled
+from .core import all_stats
+from .core import Scheduler
+from .exceptions import RateLimitLow, RateLimitExceeded
+
+__all__ = ['background', 'is_background', 'get_scheduler', 'scheduled', 'all_stats', 'Scheduler', 'RateLimitLow', 'RateLimitExceeded']
@@ -0,0 +1,121 @@
+from .exceptions import RateLimitLow, RateLimitExceeded
+from contextlib import contextmanager
+from functools import wraps
+from contextvars import ContextVar
+from time import time, sleep
+import threading
+import logging
+import github
+
+_local = threading.local()  # depth: 当前线程嵌套的请求层数
+_background = ContextVar("background", default=False)  # 是否为后台任务, 随复制的上下文传递到线程池
+_schedulers = dict()
+_schedulers_lock = threading.Lock()
+
+
+@contextmanager
+def background():
+    """在此范围内的 GitHub 请求视为后台任务, 额度不足时放弃而不是占用交互请求的额度"""
+    token = _background.set(True)
+    try:
+        yield
+    finally:
+        _background.reset(token)
+
+
+def is_background():
+    return _background.get()
+
+
+class Scheduler(object):
+    """
+    同一 token 的 GitHub 请求共用一个客户端与一份额度
+    剩余额度与重置时间取自最近一次响应, 不额外请求
+    交互请求优先: 后台请求最多同时 background_slots 个, 剩余额度不超过 reserve 时直接放弃
+    额度耗尽时交互请求等待重置, 最多等待 max_wait 秒
+    """
+
+    def __init__(self, token, reserve=100, max_wait=10, background_slots=2, pool_size=16):
+        self.client = github.Github(token, pool_size=pool_size)  # 连接池与并发请求数一致
+        self.reserve = reserve
+        self.max_wait = max_wait
+        self._background = threading.BoundedSemaphore(background_slots)
+        self._lock = threading.Lock()
+        self.requests = {"interactive": 0, "background": 0}  # 实际发出的 HTTP 请求数
+        self.not_modified = 0  # 其中返回304的条件请求, 不计入 GitHub 的请求额度
+        self.rejected = 0
+        self.waited = 0
+        # 客户端每收到一个响应都会调用该方法, 在这里按请求计数
+        self._on_response = self.client.requester.DEBUG_ON_RESPONSE
+        self.client.requester.DEBUG_ON_RESPONSE = self._count
+
+    def _count(self, status, headers, data):
+        with self._lock:
+            self.requests["background" if is_background() else "interactive"] += 1
+            if status == 304:
+                self.not_modified += 1
+        self._on_response(status, headers, data)
+
+    @property
+    def budget(self):  # (剩余, 上限, 重置时间) 尚未请求时为 (-1, -1, 0)
+        remaining, limit = self.client.requester.rate_limiting
+        return remaining, limit, self.client.requester.rate_limiting_resettime
+
+    @contextmanager
+    def request(self):
+        depth = getattr(_local, "depth", 0)
+        if depth:  # 嵌套调用只在最外层调度
+            yield
+            return
+        priority = "background" if is_background() else "interactive"
+        remaining, limit, reset = self.budget
+        if priority == "background" and 0 <= remaining <= self.reserve:
+            with self._lock:
+                self.rejected += 1
+            raise RateLimitLow("GitHub 剩余请求额度 {} 已保留给交互请求".format(remaining))
+        if remaining == 0:
+            wait = reset - time()
+            if wait > self.max_wait:
+                with self._lock:
+                    self.rejected += 1
+                raise RateLimitExceeded("GitHub 请求额度已用完, {} 秒后重置".format(int(wait)))
+            if wait > 0:
+                logging.info("GitHub 请求额度已用完, 等待{}秒".format(round(wait, 1)))
+                with self._lock:
+                    self.waited += 1
+                sleep(wait)
+        _local.depth = depth + 1
+        try:
+            if priority == "background":
+                with self._background:
+                    yield
+            else:
+                yield
+        finally:
+            _local.depth = depth
+
+    def stats(self):
+        remaining, limit, reset = self.budget
+        return {"remaining": remaining, "limit": limit, "reset": reset, "requests": dict(self.requests),
+                "not_modified": self.not_modified, "rejected": self.rejected, "waited": self.waited}
+
+
+def get_scheduler(token):
+    with _schedulers_lock:
+        if token not in _schedulers:
+            _schedulers[token] = Scheduler(token)
+        return _schedulers[token]
+
+
+def scheduled(func):  # 方法装饰器 通过 self.scheduler 调度
+    @wraps(func)
+    def wrapper(self, *args, **kwargs):
+        with self.scheduler.request():
+            return func(self, *args, **kwargs)
+
+    return wrapper
+
+
+def all_stats():  # 按 token 末四位区分
+    with _schedulers_lock:
+        return {"****" + token[-4:]: scheduler.stats() for token, scheduler in _schedulers.items()}
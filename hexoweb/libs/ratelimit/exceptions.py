@@ -0,0 +1,14 @@
+class QexoRateLimitException(Exception):
+    """Base QexoRateLimit exception."""
+
+
+class RateLimitLow(QexoRateLimitException):
+    """
+    The remaining request budget is reserved for interactive requests, background work should use cached data.
+    """
+
+
+class RateLimitExceeded(QexoRateLimitException):
+    """
+    The request budget is exhausted and will not reset soon enough to wait for it.
+    """
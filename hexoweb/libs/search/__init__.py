@@ -0,0 +1,5 @@
+from .core import get_engine
+from .core import all_engines
+from .core import make_snippet
+
+__all__ = ['get_engine', 'all_engines', 'make_snippet']
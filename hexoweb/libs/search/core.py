@@ -0,0 +1,81 @@
+from django.db import connection
+from django.db.models import Q
+from html import escape
+import re
+
+MARK_START, MARK_END = "\x02", "\x03"  # 数据库返回的摘要中的高亮标记, 转义后替换为 <mark>
+
+
+def split_terms(query):  # 按空白拆分搜索词, 去掉重复
+    terms = list()
+    for term in (query or "").split():
+        if term not in terms:
+            terms.append(term)
+    return terms
+
+
+def highlight(snippet):  # 转义摘要并把高亮标记替换为 <mark>, 文章内容中的 HTML 不会被渲染
+    snippet = re.sub(r"\s+", " ", snippet or "").strip()
+    return escape(snippet).replace(MARK_START, "<mark>").replace(MARK_END, "</mark>")
+
+
+def make_snippet(text, terms, width=60):
+    """在 Python 中截取第一个匹配附近的文字作为摘要 用于数据库不提供摘要函数时"""
+    text = re.sub(r"\s+", " ", text or "")
+    lower = text.casefold()
+    positions = [lower.find(term.casefold()) for term in terms]
+    positions = [position for position in positions if position >= 0]
+    start = max(min(positions) - width // 2, 0) if positions else 0
+    snippet = text[start:start + width * 2]
+    for term in sorted(terms, key=len, reverse=True):
+        snippet = re.sub("(" + re.escape(term) + ")", MARK_START + r"\1" + MARK_END, snippet, flags=re.I)
+    return highlight(("..." if start else "") + snippet + ("..." if start + width * 2 < len(text) else ""))
+
+
+class Engine(object):
+    """
+    文章全文搜索 基类逐条匹配, 用于不支持全文索引的数据库
+    search 返回按相关度排序的 [{"path": 文件路径, "title": 标题, "snippet": 高亮摘要(HTML), "score": 相关度}, ...]
+    """
+    name = "fallback"
+    vendor = None
+
+    def __init__(self):
+        from hexoweb.models import PostSearch, PostModel
+        self.model = PostSearch
+        self.table = PostSearch._meta.db_table
+        self.posts = PostModel
+
+    def _published(self, column):  # 只匹配已发布文章的 SQL 条件与参数, 草稿与未建立索引的文件不会出现
+        return " AND {} IN (SELECT path FROM {} WHERE status = %s)".format(column, self.posts._meta.db_table), [True]
+
+    def search(self, query, limit=20, published=False):
+        """:param published: 为True时只搜索已发布的文章"""
+        terms = split_terms(query)
+        if not terms:
+            return []
+        documents = self.model.objects.all()
+        if published:
+            documents = documents.filter(path__in=self.posts.objects.filter(status=True).values("path"))
+        for term in terms:
+            documents = documents.filter(Q(title__icontains=term) | Q(tags__icontains=term) | Q(body__icontains=term))
+        results = list()
+        for document in documents.values("path", "title", "tags", "body")[:limit * 5]:
+            score = sum(3 * (term.casefold() in document["title"].casefold()) +
+                        2 * (term.casefold() in document["tags"].casefold()) +
+                        document["body"].casefold().count(term.casefold()) for term in terms)
+            results.append({"path": document["path"], "title": document["title"],
+                            "snippet": make_snippet(document["body"], terms), "score": float(score)})
+        return sorted(results, key=lambda result: -result["score"])[:limit]
+
+
+from .engines import _all_engines
+
+
+def all_engines():
+    return list(_all_engines.keys())
+
+
+def get_engine(vendor=None):
+    """根据当前数据库选择搜索实现 没有对应实现时逐条匹配"""
+    return _all_engines.get(vendor or connection.vendor, Engine)()
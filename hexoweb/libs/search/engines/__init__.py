@@ -0,0 +1,9 @@
+from . import sqlite
+from . import postgresql
+from . import mysql
+
+_all_engines = {
+    sqlite.SQLite.vendor: sqlite.SQLite,
+    postgresql.PostgreSQL.vendor: postgresql.PostgreSQL,
+    mysql.MySQL.vendor: mysql.MySQL
+}
@@ -0,0 +1,23 @@
+from django.db import connection
+from ..core import Engine, split_terms, make_snippet
+
+
+class MySQL(Engine):
+    """title/tags/body 上的 FULLTEXT 索引, 使用 ngram 分词支持中文"""
+    name = "mysql-fulltext"
+    vendor = "mysql"
+
+    def search(self, query, limit=20, published=False):
+        terms = split_terms(query)
+        if not terms:
+            return []
+        condition, params = self._published("path") if published else ("", [])
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT path, title, body, MATCH(title, tags, body) AGAINST (%s IN NATURAL LANGUAGE MODE) AS score "
+                "FROM {table} WHERE MATCH(title, tags, body) AGAINST (%s IN NATURAL LANGUAGE MODE){condition} "
+                "ORDER BY score DESC LIMIT %s".format(table=self.table, condition=condition),
+                [query, query] + params + [limit])
+            rows = cursor.fetchall()
+        return [{"path": path, "title": title, "snippet": make_snippet(body, terms), "score": float(score)}
+                for path, title, body, score in rows]
@@ -0,0 +1,27 @@
+from django.db import connection
+from ..core import Engine, split_terms, highlight, MARK_START, MARK_END
+
+HEADLINE_OPTIONS = 'StartSel="{}", StopSel="{}", MaxFragments=1, MaxWords=30, MinWords=10'.format(MARK_START, MARK_END)
+
+
+class PostgreSQL(Engine):
+    """document 为 title/tags/body 加权生成的 tsvector 列, 使用 GIN 索引"""
+    name = "postgresql-tsvector"
+    vendor = "postgresql"
+
+    def search(self, query, limit=20, published=False):
+        if not split_terms(query):
+            return []
+        condition, params = self._published("path") if published else ("", [])
+        with connection.cursor() as cursor:
+            # 先按相关度取出前 limit 篇, 只为这些文章生成摘要
+            cursor.execute(
+                "SELECT path, title, ts_headline('simple', body, q, %s), score FROM ("
+                "SELECT path, title, body, q, ts_rank_cd(document, q) AS score "
+                "FROM {table}, websearch_to_tsquery('simple', %s) q WHERE document @@ q{condition} "
+                "ORDER BY score DESC LIMIT %s) results ORDER BY score DESC".format(table=self.table,
+                                                                                   condition=condition),
+                [HEADLINE_OPTIONS, query] + params + [limit])
+            rows = cursor.fetchall()
+        return [{"path": path, "title": title, "snippet": highlight(snippet), "score": float(score)}
+                for path, title, snippet, score in rows]
@@ -0,0 +1,38 @@
+from django.db import connection
+from ..core import Engine, split_terms, highlight, MARK_START, MARK_END
+
+FTS_TABLE = "hexoweb_postsearch_fts"
+
+
+class SQLite(Engine):
+    """FTS5 外部内容表, 由触发器与 hexoweb_postsearch 同步 trigram 分词支持中文子串搜索"""
+    name = "sqlite-fts5"
+    vendor = "sqlite"
+
+    def _tokenizer(self):  # 未建立全文索引时返回None
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT sql FROM sqlite_master WHERE name = %s", [FTS_TABLE])
+            row = cursor.fetchone()
+        if row is None:
+            return None
+        return "trigram" if "trigram" in row[0] else "unicode61"
+
+    def search(self, query, limit=20, published=False):
+        terms = split_terms(query)
+        tokenizer = self._tokenizer()
+        # trigram 无法匹配少于3个字符的词, 交给逐条匹配
+        if not terms or tokenizer is None or (tokenizer == "trigram" and any(len(term) < 3 for term in terms)):
+            return super(SQLite, self).search(query, limit, published)
+        match = " ".join('"{}"'.format(term.replace('"', '""')) for term in terms)
+        condition, params = self._published("d.path") if published else ("", [])
+        with connection.cursor() as cursor:
+            # bm25 越小越相关, 标题与标签的权重高于正文
+            cursor.execute(
+                "SELECT d.path, d.title, snippet({fts}, -1, %s, %s, '...', 24), bm25({fts}, 10.0, 5.0, 1.0) AS score "
+                "FROM {fts} JOIN {table} d ON d.id = {fts}.rowid "
+                "WHERE {fts} MATCH %s{condition} ORDER BY score LIMIT %s".format(fts=FTS_TABLE, table=self.table,
+                                                                                  condition=condition),
+                [MARK_START, MARK_END, match] + params + [limit])
+            rows = cursor.fetchall()
+        return [{"path": path, "title": title, "snippet": highlight(snippet), "score": -score}
+                for path, title, snippet, score in rows]
@@ -0,0 +1,39 @@
+# Generated by Django 3.2.25 on 2026-10-16 10:12
+
+from django.db import migrations, models
+
+
+def remove_duplicates(apps, schema_editor):
+    # 同名记录只保留一条, 否则无法建立唯一索引
+    for model_name in ["SettingModel", "CustomModel"]:
+        model = apps.get_model("hexoweb", model_name)
+        already = set()
+        duplicates = list()
+        for pk, name in model.objects.values_list("id", "name"):
+            if name in already:
+                duplicates.append(pk)
+            else:
+                already.add(name)
+        for i in range(0, len(duplicates), 500):
+            model.objects.filter(id__in=duplicates[i:i + 500]).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hexoweb', '0003_imagemodel_deleteconfig'),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicates, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='settingmodel',
+            name='name',
+            field=models.CharField(max_length=255, unique=True),
+        ),
+        migrations.AlterField(
+            model_name='custommodel',
+            name='name',
+            field=models.CharField(max_length=255, unique=True),
+        ),
+    ]
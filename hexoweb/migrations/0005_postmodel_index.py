@@ -0,0 +1,67 @@
+# Generated by Django 3.2.25 on 2026-10-17 00:13
+
+from django.db import migrations, models
+
+# 路径保持 TextField 不截断已有数据, MySQL 的 TEXT 列只能建立前缀索引
+PATH_INDEX_SQL = {
+    "sqlite": "CREATE INDEX hexoweb_postmodel_path_idx ON hexoweb_postmodel (path)",
+    "postgresql": "CREATE INDEX hexoweb_postmodel_path_idx ON hexoweb_postmodel (path)",
+    "mysql": "CREATE INDEX hexoweb_postmodel_path_idx ON hexoweb_postmodel (path(255))",
+}
+
+DROP_PATH_INDEX_SQL = {
+    "sqlite": "DROP INDEX IF EXISTS hexoweb_postmodel_path_idx",
+    "postgresql": "DROP INDEX IF EXISTS hexoweb_postmodel_path_idx",
+    "mysql": "DROP INDEX hexoweb_postmodel_path_idx ON hexoweb_postmodel",
+}
+
+
+def create_path_index(apps, schema_editor):
+    if schema_editor.connection.vendor in PATH_INDEX_SQL:
+        schema_editor.execute(PATH_INDEX_SQL[schema_editor.connection.vendor])
+
+
+def drop_path_index(apps, schema_editor):
+    if schema_editor.connection.vendor in DROP_PATH_INDEX_SQL:
+        schema_editor.execute(DROP_PATH_INDEX_SQL[schema_editor.connection.vendor])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hexoweb', '0004_unique_setting_custom_name'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='postmodel',
+            name='abbrlink',
+            field=models.CharField(blank=True, default='', max_length=255),
+        ),
+        migrations.AddField(
+            model_name='postmodel',
+            name='categories',
+            field=models.TextField(blank=True, default='[]', max_length=2147483647),
+        ),
+        migrations.AddField(
+            model_name='postmodel',
+            name='sha',
+            field=models.CharField(blank=True, default='', max_length=64),
+        ),
+        migrations.AddField(
+            model_name='postmodel',
+            name='tags',
+            field=models.TextField(blank=True, default='[]', max_length=2147483647),
+        ),
+        migrations.AddField(
+            model_name='postmodel',
+            name='updated',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='postmodel',
+            name='date',
+            field=models.FloatField(db_index=True),
+        ),
+        migrations.RunPython(create_path_index, drop_path_index),
+    ]
@@ -0,0 +1,78 @@
+# Generated by Django 3.2.25 on 2026-10-17 00:16
+
+from django.db import migrations, models, transaction, DatabaseError
+
+# 依次尝试, 使用第一个成功的方案 全部失败时搜索退回逐条匹配
+# SQLite 的外部内容表以整数主键作为 content_rowid, 与隐式 rowid 不同 VACUUM 后不会改变
+FULLTEXT_SQL = {
+    "sqlite": [
+        [
+            "CREATE VIRTUAL TABLE hexoweb_postsearch_fts USING fts5(title, tags, body, content='hexoweb_postsearch', "
+            "content_rowid='id', tokenize='{}')".format(tokenizer),
+            "CREATE TRIGGER hexoweb_postsearch_ai AFTER INSERT ON hexoweb_postsearch BEGIN "
+            "INSERT INTO hexoweb_postsearch_fts(rowid, title, tags, body) VALUES (new.id, new.title, new.tags, new.body); END",
+            "CREATE TRIGGER hexoweb_postsearch_ad AFTER DELETE ON hexoweb_postsearch BEGIN "
+            "INSERT INTO hexoweb_postsearch_fts(hexoweb_postsearch_fts, rowid, title, tags, body) "
+            "VALUES ('delete', old.id, old.title, old.tags, old.body); END",
+            "CREATE TRIGGER hexoweb_postsearch_au AFTER UPDATE ON hexoweb_postsearch BEGIN "
+            "INSERT INTO hexoweb_postsearch_fts(hexoweb_postsearch_fts, rowid, title, tags, body) "
+            "VALUES ('delete', old.id, old.title, old.tags, old.body); "
+            "INSERT INTO hexoweb_postsearch_fts(rowid, title, tags, body) VALUES (new.id, new.title, new.tags, new.body); END",
+        ] for tokenizer in ("trigram", "unicode61")
+    ],
+    "postgresql": [
+        [
+            "ALTER TABLE hexoweb_postsearch ADD COLUMN document tsvector GENERATED ALWAYS AS ("
+            "setweight(to_tsvector('simple', coalesce(title, '')), 'A') || "
+            "setweight(to_tsvector('simple', coalesce(tags, '')), 'B') || "
+            "setweight(to_tsvector('simple', coalesce(body, '')), 'C')) STORED",
+            "CREATE INDEX hexoweb_postsearch_document ON hexoweb_postsearch USING GIN (document)",
+        ]
+    ],
+    "mysql": [
+        ["ALTER TABLE hexoweb_postsearch ADD FULLTEXT INDEX hexoweb_postsearch_fulltext (title, tags, body) WITH PARSER ngram"],
+        ["ALTER TABLE hexoweb_postsearch ADD FULLTEXT INDEX hexoweb_postsearch_fulltext (title, tags, body)"],
+    ],
+}
+
+DROP_SQL = {
+    "sqlite": ["DROP TRIGGER IF EXISTS hexoweb_postsearch_ai", "DROP TRIGGER IF EXISTS hexoweb_postsearch_ad",
+               "DROP TRIGGER IF EXISTS hexoweb_postsearch_au", "DROP TABLE IF EXISTS hexoweb_postsearch_fts"],
+}
+
+
+def create_fulltext(apps, schema_editor):
+    for statements in FULLTEXT_SQL.get(schema_editor.connection.vendor, []):
+        try:
+            with transaction.atomic(using=schema_editor.connection.alias):
+                for statement in statements:
+                    schema_editor.execute(statement)
+            return
+        except DatabaseError:
+            continue
+
+
+def drop_fulltext(apps, schema_editor):
+    for statement in DROP_SQL.get(schema_editor.connection.vendor, []):
+        schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hexoweb', '0005_postmodel_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PostSearch',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('path', models.CharField(max_length=255, unique=True)),
+                ('title', models.TextField(blank=True, default='', max_length=2147483647)),
+                ('tags', models.TextField(blank=True, default='', max_length=2147483647)),
+                ('body', models.TextField(blank=True, default='', max_length=2147483647)),
+            ],
+        ),
+        migrations.RunPython(create_fulltext, drop_fulltext),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 3.2.25 on 2026-10-17 00:18
+
+from django.db import migrations, models
+import django.db.models.deletion
+import json
+import uuid
+
+
+def build_terms(apps, schema_editor):
+    # 根据已有文章索引中的标签与分类生成记录
+    PostModel = apps.get_model("hexoweb", "PostModel")
+    PostTerm = apps.get_model("hexoweb", "PostTerm")
+    terms = list()
+    for post in PostModel.objects.all():
+        for kind in ("tags", "categories"):
+            try:
+                names = json.loads(getattr(post, kind) or "[]")
+            except ValueError:
+                names = []
+            terms += [PostTerm(post=post, kind=kind, name=str(name)[:255]) for name in names]
+    PostTerm.objects.bulk_create(terms, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hexoweb', '0006_postsearch'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PostTerm',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('kind', models.CharField(max_length=16)),
+                ('name', models.CharField(max_length=255)),
+                ('post', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='terms', to='hexoweb.postmodel')),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='postterm',
+            index=models.Index(fields=['kind', 'name'], name='hexoweb_pos_kind_b9e7d4_idx'),
+        ),
+        migrations.RunPython(build_terms, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,26 @@
+from django.db import migrations
+import json
+
+
+def encode_update_cache(apps, schema_editor):
+    # 旧版本以纯文本保存 update 缓存, 现在的缓存层按 JSON 读取, 转换后才不会被当作损坏的缓存而重复发送更新通知
+    Cache = apps.get_model("hexoweb", "Cache")
+    for cache in Cache.objects.filter(name="update"):
+        try:
+            if isinstance(json.loads(cache.content), str):
+                continue
+        except ValueError:
+            pass
+        cache.content = json.dumps(cache.content)
+        cache.save(update_fields=["content"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hexoweb', '0007_postterm'),
+    ]
+
+    operations = [
+        migrations.RunPython(encode_update_cache, migrations.RunPython.noop),
+    ]
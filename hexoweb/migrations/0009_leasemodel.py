@@ -0,0 +1,29 @@
+# Generated by Django 3.2.25 on 2026-10-17 00:49
+
+from django.db import migrations, models
+import uuid
+
+
+def remove_cache_leases(apps, schema_editor):
+    # 旧版本把租约保存在缓存表中, 改用独立的表后不再需要
+    apps.get_model("hexoweb", "Cache").objects.filter(name__startswith="lease.").delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hexoweb', '0008_update_cache_json'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LeaseModel',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('name', models.CharField(max_length=255, unique=True)),
+                ('token', models.CharField(max_length=32)),
+                ('expires', models.FloatField()),
+            ],
+        ),
+        migrations.RunPython(remove_cache_leases, migrations.RunPython.noop),
+    ]
@@ -8,9 +8,17 @@ class Cache(models.Model):
     content = models.TextField(max_length=0x7FFFFFFF, blank=True)
 
 
+class LeaseModel(models.Model):
+    # 跨进程租约 名称唯一, 插入冲突说明租约已被其他进程持有
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    name = models.CharField(max_length=0xFF, unique=True)
+    token = models.CharField(max_length=0x20)
+    expires = models.FloatField()
+
+
 class SettingModel(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
-    name = models.TextField(max_length=0x7FFFFFFF)
+    name = models.CharField(max_length=0xFF, unique=True)
     content = models.TextField(max_length=0x7FFFFFFF, blank=True)
 
 
@@ -43,7 +51,7 @@ class NotificationModel(models.Model):
 
 class CustomModel(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
-    name = models.TextField(max_length=0x7FFFFFFF)
+    name = models.CharField(max_length=0xFF, unique=True)
     content = models.TextField(max_length=0x7FFFFFFF, blank=True)
 
 
@@ -71,7 +79,33 @@ class PostModel(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     title = models.TextField(max_length=0x7FFFFFFF, blank=False)
     filename = models.TextField(max_length=0x7FFFFFFF, blank=False)
-    path = models.TextField(max_length=0x7FFFFFFF, blank=False)
-    date = models.FloatField()
+    path = models.TextField(max_length=0x7FFFFFFF, blank=False)  # 保持不限长度, 索引由迁移按数据库类型建立
+    date = models.FloatField(db_index=True)
+    updated = models.FloatField(null=True, blank=True)
     front_matter = models.TextField(max_length=0x7FFFFFFF, blank=True, default="{}")
     status = models.BooleanField(default=True)
+    tags = models.TextField(max_length=0x7FFFFFFF, blank=True, default="[]")
+    categories = models.TextField(max_length=0x7FFFFFFF, blank=True, default="[]")
+    abbrlink = models.CharField(max_length=0xFF, blank=True, default="")
+    sha = models.CharField(max_length=0x40, blank=True, default="")  # 建立索引时文件的版本(blob sha, 本地为修改时间与大小), 未变化则跳过
+
+
+class PostSearch(models.Model):
+    # 文章全文搜索的内容 全文索引由迁移按数据库类型建立, 见 hexoweb.libs.search
+    # 整数主键作为 SQLite FTS5 外部内容表的 content_rowid, 与隐式 rowid 不同 VACUUM 后不会改变
+    id = models.BigAutoField(primary_key=True)
+    path = models.CharField(max_length=0xFF, unique=True)
+    title = models.TextField(max_length=0x7FFFFFFF, blank=True, default="")
+    tags = models.TextField(max_length=0x7FFFFFFF, blank=True, default="")
+    body = models.TextField(max_length=0x7FFFFFFF, blank=True, default="")
+
+
+class PostTerm(models.Model):
+    # 文章的标签与分类 随文章索引维护, 用于按标签/分类统计与列出文章
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    post = models.ForeignKey(PostModel, on_delete=models.CASCADE, related_name="terms")
+    kind = models.CharField(max_length=0x10)  # tags/categories
+    name = models.CharField(max_length=0xFF)
+
+    class Meta:
+        indexes = [models.Index(fields=["kind", "name"])]
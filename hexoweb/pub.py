@@ -24,7 +24,7 @@ def save(request):
         try:
             Provider().save(file_path, content, commitchange)
             context = {"msg": "OK!", "status": True}
-            delete_all_caches()
+            patch_caches(saved={file_path: content})
         except Exception as error:
             context = {"msg": repr(error), "status": False}
     return JsonResponse(safe=False, data=context)
@@ -44,12 +44,35 @@ def delete(request):
                 context = {"msg": gettext("DEL_SUCCESS_AND_DEPLOY"), "status": True}
             else:
                 context = {"msg": gettext("DEL_SUCCESS"), "status": True}
-            delete_all_caches()
+            patch_caches(deleted=[file_path])
         except Exception as error:
             context = {"msg": repr(error)}
     return JsonResponse(safe=False, data=context)
 
 
+# 批量发布/取消发布/删除 pub/batch
+@csrf_exempt
+def batch(request):
+    if not check_if_api_auth(request):
+        return JsonResponse(safe=False, data={"msg": "鉴权错误！", "status": False})
+    context = dict(msg="Error!", status=False)
+    if request.method == "POST":
+        try:
+            operations = json.loads(request.POST.get('operations'))
+            commitchange = request.POST.get('commitchange') if request.POST.get(
+                'commitchange') else f"Batch Update {len(operations)} Files by Qexo"
+            result = Provider().batch(operations, commitchange)
+            if result[0]:
+                context = {"msg": gettext("BATCH_SUCCESS_AND_DEPLOY").format(len(operations)), "status": True}
+            else:
+                context = {"msg": gettext("BATCH_SUCCESS").format(len(operations)), "status": True}
+            patch_caches(moved=dict(result[1], **result[2]), deleted=result[3])
+            batch_postmark(result[1], result[2], result[3])
+        except Exception as error:
+            context = {"msg": repr(error), "status": False}
+    return JsonResponse(safe=False, data=context)
+
+
 # 自动设置 Webhook 事件 pub/create_webhook
 @csrf_exempt
 def create_webhook_config(request):
@@ -83,24 +106,39 @@ def get_posts(request):
         return JsonResponse(safe=False, data={"msg": "鉴权错误！", "status": False})
     try:
         search = request.GET.get("s")
-        if search:
-            cache = Cache.objects.filter(name="posts." + search)
-            if cache.count():
-                posts = json.loads(cache.first().content)
-            else:
-                posts = update_posts_cache(search)
-        else:
-            cache = Cache.objects.filter(name="posts")
-            if cache.count():
-                posts = json.loads(cache.first().content)
-            else:
-                posts = update_posts_cache(search)
+        posts = update_posts_cache(search)
         context = {"status": True, "posts": posts}
     except Exception as error:
         context = {"status": False, "error": repr(error)}
     return JsonResponse(safe=False, data=context)
 
 
+# 全文搜索文章(不包含草稿) pub/search_posts
+@csrf_exempt
+def search_posts(request):
+    if not check_if_api_auth(request):
+        return JsonResponse(safe=False, data={"msg": "鉴权错误！", "status": False})
+    try:
+        results = full_text_search(request.GET.get("s"), int(request.GET.get("limit") or 20), True)
+        context = {"status": True, "results": results}
+    except Exception as error:
+        context = {"status": False, "error": repr(error)}
+    return JsonResponse(safe=False, data=context)
+
+
+# 获取标签与分类统计 pub/get_taxonomy
+@csrf_exempt
+def get_taxonomy(request):
+    if not check_if_api_auth(request):
+        return JsonResponse(safe=False, data={"msg": "鉴权错误！", "status": False})
+    try:
+        kinds = [request.GET.get("kind")] if request.GET.get("kind") else TAXONOMY_KINDS
+        context = {"status": True, "data": aggregate_taxonomy(kinds, request.GET.get("name"), True)}
+    except Exception as error:
+        context = {"status": False, "error": repr(error)}
+    return JsonResponse(safe=False, data=context)
+
+
 # 获取所有页面 pub/get_pages
 @csrf_exempt
 def get_pages(request):
@@ -108,18 +146,7 @@ def get_pages(request):
         return JsonResponse(safe=False, data={"msg": "鉴权错误！", "status": False})
     try:
         search = request.GET.get("s")
-        if search:
-            cache = Cache.objects.filter(name="pages." + search)
-            if cache.count():
-                posts = json.loads(cache.first().content)
-            else:
-                posts = update_pages_cache(search)
-        else:
-            cache = Cache.objects.filter(name="pages")
-            if cache.count():
-                posts = json.loads(cache.first().content)
-            else:
-                posts = update_pages_cache(search)
+        posts = update_pages_cache(search)
         context = {"status": True, "pages": posts}
     except Exception as error:
         context = {"status": False, "error": repr(error)}
@@ -133,18 +160,7 @@ def get_configs(request):
         return JsonResponse(safe=False, data={"msg": "鉴权错误！", "status": False})
     try:
         search = request.GET.get("s")
-        if search:
-            cache = Cache.objects.filter(name="configs." + search)
-            if cache.count():
-                posts = json.loads(cache.first().content)
-            else:
-                posts = update_configs_cache(search)
-        else:
-            cache = Cache.objects.filter(name="configs")
-            if cache.count():
-                posts = json.loads(cache.first().content)
-            else:
-                posts = update_configs_cache(search)
+        posts = update_configs_cache(search)
         context = {"status": True, "configs": posts}
     except Exception as error:
         context = {"status": False, "error": repr(error)}
@@ -442,11 +458,7 @@ def get_notifications(request):
 @csrf_exempt
 def status(request):
     try:
-        cache = Cache.objects.filter(name="posts")
-        if cache.count():
-            posts = json.loads(cache.first().content)
-        else:
-            posts = update_posts_cache()
+        posts = update_posts_cache()
         posts_count = len(posts)
         last = get_setting("LAST_LOGIN")
         context = {"data": {"posts": str(posts_count), "last": last}, "status": True}
@@ -1,3 +1,199 @@
-from django.test import TestCase
+from unittest import mock
 
-# Create your tests here.
+from django.test import SimpleTestCase, TestCase
+
+from hexoweb import functions
+from hexoweb.libs.platforms import get_provider, git_blob_sha
+from hexoweb.libs.platforms.core import Provider
+from hexoweb.libs.postparser import parse_article
+from hexoweb.libs.search import get_engine
+from hexoweb.models import LeaseModel, PostModel, PostSearch
+
+
+class ParseArticleTests(SimpleTestCase):
+    def test_toml_front_matter_with_rule_in_body(self):
+        article = "+++\ntitle = 'Hello'\n+++\nIntro\n\n---\n\nMore"
+        front_matter, passage, _ = parse_article(article)
+        self.assertEqual(front_matter, {"title": "Hello"})
+        self.assertEqual(passage, "\nIntro\n\n---\n\nMore")
+
+    def test_yaml_front_matter_with_rule_in_body(self):
+        front_matter, passage, _ = parse_article("---\ntitle: Hello\n---\nIntro\n\n---\n\nMore")
+        self.assertEqual(front_matter, {"title": "Hello"})
+        self.assertEqual(passage, "\nIntro\n\n---\n\nMore")
+
+    def test_omitted_opening_separator(self):
+        front_matter, passage, _ = parse_article("title: Hello\n---\nbody")
+        self.assertEqual(front_matter, {"title": "Hello"})
+        self.assertEqual(passage, "\nbody")
+
+
+class SearchTests(TestCase):
+    def setUp(self):
+        for path, status in (("source/_posts/a.md", True), ("source/_drafts/b.md", False)):
+            PostModel.objects.create(path=path, title=path, filename=path, date=0, status=status)
+            PostSearch.objects.create(path=path, title=path, body="searchable content")
+
+    def test_published_search_excludes_drafts(self):
+        for engine in (get_engine(), get_engine("fallback")):
+            self.assertEqual(len(engine.search("searchable", 10)), 2)
+            self.assertEqual([result["path"] for result in engine.search("searchable", 10, True)],
+                             ["source/_posts/a.md"])
+
+
+class LeaseTests(TestCase):
+    def test_held_lease_is_exclusive(self):
+        token = functions.acquire_lease("test")
+        self.assertIsNotNone(token)
+        self.assertIsNone(functions.acquire_lease("test"))
+        functions.release_lease("test", "other")
+        self.assertIsNone(functions.acquire_lease("test"))
+        functions.release_lease("test", token)
+        self.assertIsNotNone(functions.acquire_lease("test"))
+
+    def test_expired_lease_is_taken_over_once(self):
+        functions.acquire_lease("test", ttl=-1)
+        token = functions.acquire_lease("test")
+        self.assertIsNotNone(token)
+        self.assertIsNone(functions.acquire_lease("test"))
+        self.assertEqual(LeaseModel.objects.get(name="test").token, token)
+
+    def test_single_flight_returns_stale_while_leased(self):
+        functions.Caches().clear()
+        functions.update_caches(functions.STALE_PREFIX + "posts", [{"path": "source/_posts/a.md"}])
+        functions.acquire_lease("caches.posts")
+        with mock.patch.object(functions, "LEASE_WAIT", 0), mock.patch.object(functions, "Provider") as provider:
+            self.assertEqual(functions._single_flight("posts"), [{"path": "source/_posts/a.md"}])
+        provider.assert_not_called()
+
+
+class TreeProvider(Provider):
+    # 内存中的仓库 逐个目录列出内容, 与远程平台逐级获取的结果相同
+    FILES = ["_config.yml", "package.json", "scaffolds/post.md", "node_modules/x/package.json",
+             ".github/workflows/deploy.yml", "themes/t/_config.yml", "themes/t/languages/en.yml",
+             "themes/t/source/css/a.json", "source/links.md", "source/about/index.md", "source/about/deep/x/y.md",
+             "source/_data/menu.yml", "source/_posts/a.md", "source/_posts/2024/b.md", "source/_posts/2024/01/c.md",
+             "source/_posts/_data/cfg.yml", "source/_drafts/d.md"]
+
+    def __init__(self, files=None):
+        super().__init__("Hexo")
+        self.files = list(files or self.FILES)
+
+    def _list_dir(self, path, sha=None):
+        path = path.strip("/")
+        prefix = path + "/" if path else ""
+        results = dict()
+        for file in self.files:
+            if not file.startswith(prefix):
+                continue
+            name = file[len(prefix):].split("/")[0]
+            if name == file[len(prefix):]:
+                results[name] = {"name": name, "path": prefix + name, "type": "file", "size": 1}
+            else:
+                results.setdefault(name, {"name": name, "path": prefix + name, "type": "dir"})
+        return list(results.values())
+
+
+class TreeWalkTests(SimpleTestCase):
+    WALKS = [("", 1, []), ("", -1, []), ("source", 2, ["_posts", "_drafts"]), ("source/_posts", -1, []),
+             ("themes", 2, []), (".github", 3, []), ("source", -1, ["_posts"]), ("source/_posts", 1, []),
+             ("missing", -1, [])]
+
+    def test_filter_tree_matches_walk(self):
+        provider = TreeProvider()
+        entries = provider.get_tree("", -1)
+        for walk in self.WALKS:
+            self.assertEqual(sorted(entry["path"] for entry in provider._filter_tree(entries, *walk)),
+                             sorted(entry["path"] for entry in provider.get_tree(*walk)), walk)
+
+    def test_snapshot_lists_match_walks(self):
+        provider = TreeProvider()
+        snapshot = provider.get_snapshot()
+        self.assertLess(len(provider._walks()), sum(len(provider.config[kind]["path"])
+                                                     for kind in ("posts", "drafts", "pages", "configs")))
+        for kind in ("posts", "pages", "configs"):
+            self.assertEqual(getattr(provider, "get_" + kind)(snapshot), getattr(provider, "get_" + kind)(), kind)
+
+    def test_covered_walks_are_subsets(self):
+        provider = TreeProvider()
+        entries = provider.get_tree("", -1)
+        for outer in self.WALKS:
+            for inner in self.WALKS:
+                if provider._covers(outer, inner):
+                    self.assertEqual(provider._filter_tree(provider.get_tree(*outer), *inner),
+                                     provider._filter_tree(entries, *inner), (outer, inner))
+
+
+class PatchCachesTests(TestCase):
+    def setUp(self):
+        functions.Caches().clear()
+
+    def test_patch_matches_rebuild(self):
+        provider = TreeProvider()
+        functions.update_caches("posts", functions._sort_items("posts", provider.get_posts()))
+        with mock.patch.object(functions, "Provider", return_value=provider):
+            functions.patch_caches(saved={"source/_posts/new.md": "x"}, deleted=["source/_posts/2024"],
+                                   moved={"source/_drafts/d.md": "source/_posts/d.md"})
+        expected = TreeProvider([file for file in TreeProvider.FILES if not file.startswith("source/_posts/2024/")
+                                 and file != "source/_drafts/d.md"] + ["source/_posts/new.md", "source/_posts/d.md"])
+        self.assertEqual(functions.get_caches("posts"), functions._sort_items("posts", expected.get_posts()))
+
+
+class SkipUnchangedTests(SimpleTestCase):
+    def setUp(self):
+        self.provider = get_provider("github", token="test", repo="user/repo", branch="main", path="",
+                                     config="Hexo")
+        self.provider.repo = mock.Mock()
+        self.provider.repo.update_file.return_value = {"commit": mock.Mock(sha="c", parents=[mock.Mock(sha="b")])}
+        self.files = {"source/_posts/a.md": "one"}
+        self.head = "a"
+        self.provider._get_head = lambda: self.head
+        self.provider._get_entries = lambda: [{"name": path.split("/")[-1], "path": path, "type": "file", "size": 1,
+                                               "sha": git_blob_sha(content)} for path, content in self.files.items()]
+        self.provider.get_snapshot()
+
+    def test_unchanged_content_is_skipped(self):
+        self.provider.save("source/_posts/a.md", "one")
+        self.provider.repo.update_file.assert_not_called()
+
+    def test_revert_after_another_commit_is_saved(self):
+        self.files["source/_posts/a.md"] = "two"  # 其他进程提交了新内容
+        self.head = "b"
+        self.provider.save("source/_posts/a.md", "one")
+        self.provider.repo.update_file.assert_called_once()
+        self.assertEqual(self.provider.get_blob_sha("source/_posts/a.md"), git_blob_sha("one"))
+
+
+class BatchTests(SimpleTestCase):
+    class FakeProvider(Provider):
+        def __init__(self, files):
+            super().__init__("Hexo")
+            self.files = files
+            self.listed = list()
+            self.changes = None
+
+        def _get_entries(self):
+            return [{"name": path.split("/")[-1], "path": path, "type": "file", "size": 1} for path in self.files]
+
+        def get_tree(self, path, depth, exclude=None):
+            self.listed.append(path)
+            return self._filter_tree(self._get_entries(), path, depth, exclude)
+
+        def commit(self, changes, commitchange="Update by Qexo", autobuild=True):
+            self.changes = changes
+            return False
+
+    def test_delete_expands_directories_from_snapshot(self):
+        provider = self.FakeProvider(["source/_posts/a.md", "source/_posts/series/b.md", "source/_posts/series/c.md",
+                                      "themes/x/layout.ejs"])
+        result = provider.batch([{"action": "delete", "file": "source/_posts/series"},
+                                 {"action": "delete", "file": "source/_posts/a.md"}])
+        self.assertEqual(result[3], ["source/_posts/series/b.md", "source/_posts/series/c.md", "source/_posts/a.md"])
+        self.assertEqual(provider.changes, dict.fromkeys(result[3]))
+        self.assertEqual(provider.listed, [])
+
+    def test_delete_outside_snapshot_lists_the_directory(self):
+        provider = self.FakeProvider(["source/_posts/a.md", "themes/x/layout.ejs", "themes/x/style.css"])
+        result = provider.batch([{"action": "delete", "file": "themes/x"}])
+        self.assertEqual(result[3], ["themes/x/layout.ejs", "themes/x/style.css"])
+        self.assertEqual(provider.listed, ["themes/x"])
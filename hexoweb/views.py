@@ -74,11 +74,10 @@ def update_view(request):
         logging.info(gettext("NOT_INIT"))
         return redirect("/init/")
     if request.method == 'POST':
-        for setting in request.POST.keys():
-            save_setting(setting, request.POST.get(setting))
-            if setting == "PROVIDER":
-                update_provider()
-        delete_all_caches()
+        save_settings({setting: request.POST.get(setting) for setting in request.POST.keys()})
+        if "PROVIDER" in request.POST.keys():
+            update_provider()
+        delete_all_caches(keep_stale="PROVIDER" not in request.POST.keys())
     already = list()
     settings = SettingModel.objects.all()
     for query in settings:
@@ -87,6 +86,7 @@ def update_view(request):
     context = get_custom_config()
     context["settings"] = list()
     context["counter"] = 0
+    defaults = dict()
     for setting in ALL_SETTINGS:
         if setting[0] not in already:
             if setting[0] == "PROVIDER":  # migrate from 1.x
@@ -104,10 +104,11 @@ def update_view(request):
 
             else:
                 if setting[2]:
-                    save_setting(setting[0], setting[1])
+                    defaults[setting[0]] = setting[1]
                 context["settings"].append(dict(name=setting[0], value=setting[1], placeholder=setting[3]))
 
             context["counter"] += 1
+    save_settings(defaults)
     if not context["counter"]:
         save_setting("JUMP_UPDATE", "false")
         return redirect("/")
@@ -389,11 +390,7 @@ def index(request):
         return redirect("/update/")
     context = {'segment': 'index'}
     context.update(get_custom_config())
-    cache = Cache.objects.filter(name="posts")
-    if cache.count():
-        posts = json.loads(cache.first().content)
-    else:
-        posts = update_posts_cache()
+    posts = update_posts_cache()
     _images = ImageModel.objects.all().order_by("-date")
     images = list()
     for i in _images:
@@ -416,7 +413,9 @@ def index(request):
     context["images_number"] = str(len(images))
     context["breadcrumb"] = "Dashboard"
     context["breadcrumb_cn"] = gettext("DASHBOARD")
-    _recent_posts = PostModel.objects.all().order_by("-date")
+    if not get_setting("POST_INDEX_TIME"):  # 尚未建立过文章索引
+        index_posts_in_background()
+    _recent_posts = PostModel.objects.all().order_by("-date")[:5]
     context["recent_posts"] = list()
     for i in _recent_posts:
         context["recent_posts"].append({
@@ -487,7 +486,7 @@ def pages(request):
         elif "edit_config" in load_template:
             context["breadcrumb"] = "ConfigEditor"
             file_path = request.GET.get("file")
-            context["file_content"] = repr(Provider().get_content(file_path)).replace("<", "\\<").replace(">", "\\>").replace("!", "\\!")
+            context["file_content"] = escape_passage(Provider().get_content(file_path))
             context["filepath"] = file_path
             context['filename'] = file_path.split("/")[-1]
             context["breadcrumb_cn"] = gettext("EDIT_CONFIG") + ": " + context['filename']
@@ -543,18 +542,13 @@ def pages(request):
             context["breadcrumb"] = "Posts"
             context["breadcrumb_cn"] = gettext("POSTS_LIST")
             search = request.GET.get("s")
-            if search:
-                cache = Cache.objects.filter(name="posts." + search)
-                if cache.count():
-                    posts = json.loads(cache.first().content)
-                else:
-                    posts = update_posts_cache(search)
-            else:
-                cache = Cache.objects.filter(name="posts")
-                if cache.count():
-                    posts = json.loads(cache.first().content)
-                else:
-                    posts = update_posts_cache(search)
+            posts = update_posts_cache(search)
+            if search:  # 文件名匹配的文章在前, 其后为正文匹配的文章
+                found = set(post["path"] for post in posts)
+                matched = [result["path"] for result in full_text_search(search, 100) if result["path"] not in found]
+                if matched:
+                    items = {post["path"]: post for post in update_posts_cache()}
+                    posts += [items[path] for path in matched if path in items]
             for item in range(len(posts)):
                 posts[item]["size"] = convert_to_kb_mb_gb(posts[item]["size"])
             context["all_posts"] = json.dumps(posts)
@@ -566,18 +560,7 @@ def pages(request):
             context["breadcrumb"] = "Pages"
             context["breadcrumb_cn"] = gettext("PAGES_LIST")
             search = request.GET.get("s")
-            if search:
-                cache = Cache.objects.filter(name="pages." + search)
-                if cache.count():
-                    posts = json.loads(cache.first().content)
-                else:
-                    posts = update_pages_cache(search)
-            else:
-                cache = Cache.objects.filter(name="pages")
-                if cache.count():
-                    posts = json.loads(cache.first().content)
-                else:
-                    posts = update_pages_cache(search)
+            posts = update_pages_cache(search)
             for item in range(len(posts)):
                 posts[item]["size"] = convert_to_kb_mb_gb(posts[item]["size"])
             context["new_dir"] = Provider().config["pages"]["save_path"]
@@ -592,18 +575,7 @@ def pages(request):
                 logging.info(gettext("USER_IS_NOT_STAFF").format(request.user.username, request.path))
                 return page_403(request, gettext("NO_PERMISSION"))
             search = request.GET.get("s")
-            if search:
-                cache = Cache.objects.filter(name="configs." + search)
-                if cache.count():
-                    posts = json.loads(cache.first().content)
-                else:
-                    posts = update_configs_cache(search)
-            else:
-                cache = Cache.objects.filter(name="configs")
-                if cache.count():
-                    posts = json.loads(cache.first().content)
-                else:
-                    posts = update_configs_cache(search)
+            posts = update_configs_cache(search)
             for item in range(len(posts)):
                 posts[item]["size"] = convert_to_kb_mb_gb(posts[item]["size"])
             context["posts"] = json.dumps(posts)